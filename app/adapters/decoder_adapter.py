@@ -2,20 +2,37 @@
 
 from __future__ import annotations
 
+import base64
+import contextlib
 import io
 import json
+import os
+import select
+import shutil
+import struct
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Set
 
 from PIL import Image
 
+from app.adapters.workspace import temporary_workspace
+
 CHANNEL_ORDER = ["R", "G", "B", "A"]
 
+# ASCII code points that do not count towards the printable ratio; stripping them
+# with bytes.translate keeps the per-character scan in C.
+_NON_PRINTABLE_ASCII = bytes(
+    i for i in range(128) if not (chr(i).isprintable() or chr(i) in "\n\r\t")
+)
+
 # Ensure the vendor decoder package is importable.
 VENDOR_DECODER_DIR = Path(__file__).resolve().parents[2] / "vendor" / "decoder"
 if str(VENDOR_DECODER_DIR) not in sys.path:
@@ -40,6 +57,35 @@ class DecoderOptions:
     deep: bool = False
 
 
+@dataclass(slots=True)
+class Candidate:
+    """A piece of text recovered by one of the targeted extractors."""
+
+    selector: str
+    label: str
+    text: str
+    source: str
+    bytes_len: int
+    hex_preview: str
+    zlib_bytes_len: Optional[int] = None
+    zlib_text: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the plain-dict form exposed in analysis results."""
+        data: Dict[str, Any] = {
+            "selector": self.selector,
+            "label": self.label,
+            "text": self.text,
+            "source": self.source,
+            "bytes_len": self.bytes_len,
+            "hex_preview": self.hex_preview,
+        }
+        if self.zlib_bytes_len is not None:
+            data["zlib_bytes_len"] = self.zlib_bytes_len
+            data["zlib_text"] = self.zlib_text
+        return data
+
+
 def _sanitise_filename(name: str) -> str:
     candidate = Path(name).name or "upload.png"
     if "." not in candidate:
@@ -60,12 +106,82 @@ def _detect_format(image_bytes: bytes) -> str:
     return "UNKNOWN"
 
 
-def _extract_meta(image_bytes: bytes) -> Dict[str, Any]:
+def _jpeg_dimensions(image_bytes: bytes) -> Optional[tuple[int, int]]:
+    """Walk the JPEG marker segments up to the first SOFn frame header."""
+    offset = 2
+    size = len(image_bytes)
+    while offset + 4 <= size:
+        if image_bytes[offset] != 0xFF:
+            return None
+        marker = image_bytes[offset + 1]
+        if marker == 0xFF:  # Fill byte
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # Standalone markers
+            offset += 2
+            continue
+        (length,) = struct.unpack_from(">H", image_bytes, offset + 2)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            if offset + 9 > size:
+                return None
+            height, width = struct.unpack_from(">HH", image_bytes, offset + 5)
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def _header_dimensions(image_bytes: bytes, image_format: str) -> Optional[tuple[int, int]]:
+    """Read width/height straight from the container header, without decoding."""
+    try:
+        if image_format == "PNG":
+            return struct.unpack_from(">II", image_bytes, 16)
+        if image_format == "JPEG":
+            return _jpeg_dimensions(image_bytes)
+        if image_format == "BMP":
+            (header_size,) = struct.unpack_from("<I", image_bytes, 14)
+            if header_size == 12:  # OS/2 BITMAPCOREHEADER
+                return struct.unpack_from("<HH", image_bytes, 18)
+            width, height = struct.unpack_from("<ii", image_bytes, 18)
+            return width, abs(height)
+        if image_format == "WEBP":
+            chunk = image_bytes[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack_from("<HH", image_bytes, 26)
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                (bits,) = struct.unpack_from("<I", image_bytes, 21)
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                if len(image_bytes) < 30:
+                    return None
+                width = int.from_bytes(image_bytes[24:27], "little") + 1
+                height = int.from_bytes(image_bytes[27:30], "little") + 1
+                return width, height
+    except struct.error:
+        return None
+    return None
+
+
+def _extract_meta(image_bytes: bytes, image_format: Optional[str] = None) -> Dict[str, Any]:
     """Extract metadata from the image."""
+    if image_format is None:
+        image_format = _detect_format(image_bytes)
+
+    dimensions = _header_dimensions(image_bytes, image_format)
+    if dimensions is not None:
+        width, height = dimensions
+        return {
+            "format": image_format,
+            "width": width,
+            "height": height,
+            "size_bytes": len(image_bytes),
+        }
+
+    # Unknown or unusual containers: let PIL parse the header.
     try:
         with Image.open(io.BytesIO(image_bytes)) as img:
             return {
-                "format": _detect_format(image_bytes),
+                "format": image_format,
                 "width": img.width,
                 "height": img.height,
                 "size_bytes": len(image_bytes),
@@ -79,11 +195,6 @@ def _extract_meta(image_bytes: bytes) -> Dict[str, Any]:
         }
 
 
-def _detect_png(image_bytes: bytes) -> bool:
-    """Detect if the image is a PNG based on magic bytes."""
-    return _detect_format(image_bytes) == "PNG"
-
-
 def _bits_to_bytes(bits: List[int]) -> bytes:
     """Convert a list of bits into raw bytes stopping at the first null byte."""
 
@@ -105,27 +216,35 @@ def _decode_plane_bits(img_rgba: Image.Image, plane: str) -> bytes:
     """Extract bytes from the specified channel plane."""
 
     plane = plane.upper()
+    # Resolve the plane to pixel indices once instead of testing every channel per pixel.
+    indices = tuple(idx for idx, channel in enumerate(CHANNEL_ORDER) if channel in plane)
     bits: List[int] = []
 
     for pixel in img_rgba.getdata():
-        for idx, channel in enumerate(CHANNEL_ORDER):
-            if channel not in plane:
-                continue
-            channel_value = pixel[idx]
-            bits.append(channel_value & 1)
+        for idx in indices:
+            bits.append(pixel[idx] & 1)
 
     return _bits_to_bytes(bits)
 
 
-def _extract_lsb_planes(image_path: Path) -> List[Dict[str, Any]]:
-    """Attempt direct LSB extraction for common channel combinations."""
+def _extract_lsb_planes(
+    image_path: Path, img_rgba: Optional[Image.Image] = None
+) -> List[Candidate]:
+    """Attempt direct LSB extraction for common channel combinations.
 
-    try:
-        with Image.open(image_path) as img:
-            img_rgba = img.convert("RGBA")
-            img_rgba.load()
-    except Exception:
-        return []
+    A caller-supplied *img_rgba* is used as-is and left open for the caller.
+    """
+
+    if img_rgba is not None:
+        owned: ContextManager[Any] = contextlib.nullcontext()
+    else:
+        try:
+            with Image.open(image_path) as img:
+                img_rgba = img.convert("RGBA")
+                img_rgba.load()
+        except Exception:
+            return []
+        owned = img_rgba
 
     probes = [
         "RGB",
@@ -142,137 +261,360 @@ def _extract_lsb_planes(image_path: Path) -> List[Dict[str, Any]]:
         "BA",
     ]
 
-    candidates: List[Dict[str, Any]] = []
-    for plane in probes:
-        data_bytes = _decode_plane_bits(img_rgba, plane)
-        if not data_bytes:
-            continue
-
-        text = data_bytes.decode("utf-8", errors="ignore").strip()
-        if not _is_printable_text(text):
-            continue
+    candidates: List[Candidate] = []
+    # Release the decoded RGBA buffer we own as soon as every probe has run.
+    with owned:
+        for plane in probes:
+            data_bytes = _decode_plane_bits(img_rgba, plane)
+            if not data_bytes:
+                continue
 
-        hex_preview = " ".join(f"{b:02x}" for b in data_bytes[:64])
-        candidate: Dict[str, Any] = {
-            "selector": plane,
-            "label": f"LSB {plane}",
-            "text": text,
-            "source": "lsb",  # Identify our internal extractor
-            "bytes_len": len(data_bytes),
-            "hex_preview": hex_preview,
-        }
+            text = data_bytes.decode("utf-8", errors="ignore").strip()
+            if not _is_printable_text(text):
+                continue
 
-        # Attempt to detect zlib payloads for richer output
-        if len(data_bytes) > 2:
-            try:
-                inflated = zlib.decompress(data_bytes)
-            except Exception:
-                inflated = None
+            hex_preview = data_bytes[:64].hex(" ")
+            candidate = Candidate(
+                selector=plane,
+                label=f"LSB {plane}",
+                text=text,
+                source="lsb",  # Identify our internal extractor
+                bytes_len=len(data_bytes),
+                hex_preview=hex_preview,
+            )
 
-            if inflated:
-                candidate["zlib_bytes_len"] = len(inflated)
+            # Attempt to detect zlib payloads for richer output
+            if len(data_bytes) > 2:
                 try:
-                    candidate["zlib_text"] = inflated.decode("utf-8", errors="ignore").strip()
+                    inflated = zlib.decompress(data_bytes)
                 except Exception:
-                    candidate["zlib_text"] = None
+                    inflated = None
+
+                if inflated:
+                    candidate.zlib_bytes_len = len(inflated)
+                    try:
+                        candidate.zlib_text = inflated.decode("utf-8", errors="ignore").strip()
+                    except Exception:
+                        candidate.zlib_text = None
 
-        candidates.append(candidate)
+            candidates.append(candidate)
 
     return candidates
 
 
-def _extract_with_zsteg(image_path: Path) -> List[Dict[str, Any]]:
+# Targeted zsteg extraction selectors and their display labels.
+ZSTEG_SELECTORS: tuple[tuple[str, str], ...] = (
+    ("b1,r,lsb,xy", "LSB Red"),
+    ("b1,r,msb,xy", "MSB Red"),
+    ("b1,g,lsb,xy", "LSB Green"),
+    ("b1,b,lsb,xy", "LSB Blue"),
+    ("b1,rgb,lsb,xy", "LSB RGB"),
+)
+
+# Shared deadline, in seconds, for one image's whole batch of selector extractions.
+ZSTEG_TIMEOUT = 10
+
+# Ruby loop that keeps zsteg loaded and answers one JSON request per line.
+# Extracted payloads are binary, so they travel back base64-encoded.
+_ZSTEG_WORKER_SCRIPT = r"""
+require "json"
+require "stringio"
+require "zsteg"
+require "zsteg/cli/cli"
+
+out = $stdout
+out.sync = true
+out.puts JSON.dump({"ready" => true})
+while (line = $stdin.gets)
+  request = JSON.parse(line)
+  buffer = StringIO.new("".b)
+  ok = true
+  begin
+    $stdout = buffer
+    ZSteg::CLI::Cli.new(["-E", request["selector"], request["path"]]).run
+  rescue SystemExit, StandardError
+    ok = false
+  ensure
+    $stdout = out
+  end
+  out.puts JSON.dump({"ok" => ok, "data" => [buffer.string].pack("m0")})
+end
+"""
+
+
+class _ZstegWorker:
+    """Long-lived Ruby process that serves zsteg extractions over stdin/stdout."""
+
+    def __init__(self, command: Sequence[str] = ("ruby", "-e", _ZSTEG_WORKER_SCRIPT)) -> None:
+        self._command = list(command)
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen[bytes]] = None
+        self._unavailable = False
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        if self._read_line(process, timeout=10) is None:
+            self._stop(process)
+            raise RuntimeError("zsteg worker failed to start")
+        return process
+
+    @staticmethod
+    def _read_line(process: subprocess.Popen[bytes], timeout: float) -> Optional[bytes]:
+        assert process.stdout is not None
+        ready, _, _ = select.select([process.stdout], [], [], timeout)
+        if not ready:
+            return None
+        line = process.stdout.readline()
+        return line or None
+
+    @staticmethod
+    def _stop(process: subprocess.Popen[bytes]) -> None:
+        process.kill()
+        process.wait()
+        for pipe in (process.stdin, process.stdout):
+            if pipe is not None:
+                with contextlib.suppress(OSError):
+                    pipe.close()
+
+    def _discard(self) -> None:
+        """Kill and reap the current process so the next request starts a fresh one."""
+        if self._process is not None:
+            self._stop(self._process)
+            self._process = None
+
+    def extract(self, selector: str, image_path: str, timeout: float = 10) -> Optional[bytes]:
+        """Return the raw payload for *selector*, or ``None`` if zsteg produced nothing."""
+        with self._lock:
+            return self._extract(selector, image_path, timeout)
+
+    def extract_batch(
+        self, selectors: Sequence[str], image_path: str, timeout: float = ZSTEG_TIMEOUT
+    ) -> Optional[List[Optional[bytes]]]:
+        """Run *selectors* against one shared deadline.
+
+        Returns ``None`` without waiting when another analysis holds this worker;
+        selectors still pending at the deadline get ``None`` payloads.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            deadline = time.monotonic() + timeout
+            payloads: List[Optional[bytes]] = []
+            for selector in selectors:
+                remaining = deadline - time.monotonic()
+                payloads.append(
+                    self._extract(selector, image_path, remaining) if remaining > 0 else None
+                )
+            return payloads
+        finally:
+            self._lock.release()
+
+    def _extract(self, selector: str, image_path: str, timeout: float) -> Optional[bytes]:
+        if self._unavailable:
+            raise RuntimeError("zsteg worker unavailable")
+        if self._process is None or self._process.poll() is not None:
+            self._discard()
+            try:
+                self._process = self._start()
+            except (OSError, RuntimeError):
+                self._unavailable = True
+                raise
+        process = self._process
+        assert process.stdin is not None
+
+        request = json.dumps({"selector": selector, "path": image_path})
+        try:
+            process.stdin.write(request.encode("utf-8") + b"\n")
+            process.stdin.flush()
+        except BrokenPipeError:
+            self._discard()
+            return None
+
+        line = self._read_line(process, timeout)
+        if line is None:
+            # Hung or crashed; drop it so the next call starts a fresh worker.
+            self._discard()
+            return None
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            return None
+        return base64.b64decode(response.get("data", ""))
+
+
+# A few workers so concurrent sessions do not queue behind one Ruby process; when
+# all are busy the analysis falls back to one zsteg CLI process per selector.
+ZSTEG_WORKER_POOL_SIZE = 2
+_ZSTEG_WORKERS = tuple(_ZstegWorker() for _ in range(ZSTEG_WORKER_POOL_SIZE))
+
+
+def _zsteg_worker_payloads(image_arg: str) -> Optional[List[Optional[bytes]]]:
+    """Run every selector on the first idle worker, or ``None`` if none can serve."""
+    selectors = [selector for selector, _label in ZSTEG_SELECTORS]
+    for worker in _ZSTEG_WORKERS:
+        payloads = worker.extract_batch(selectors, image_arg)
+        if payloads is not None:
+            return payloads
+    return None
+
+
+def _extract_with_zsteg(image_path: Path) -> List[Candidate]:
     """
     Attempt to extract hidden text from PNG using targeted zsteg selectors.
     Returns a list of candidates with their selector and extracted text.
     """
-    candidates: List[Dict[str, Any]] = []
-    selectors = [
-        ("b1,r,lsb,xy", "LSB Red"),
-        ("b1,r,msb,xy", "MSB Red"),
-        ("b1,g,lsb,xy", "LSB Green"),
-        ("b1,b,lsb,xy", "LSB Blue"),
-        ("b1,rgb,lsb,xy", "LSB RGB"),
-    ]
+    candidates: List[Candidate] = []
+    image_arg = str(image_path)
+    try:
+        payloads = _zsteg_worker_payloads(image_arg)
+    except (OSError, RuntimeError):
+        # Ruby or the zsteg gem is unavailable as a library.
+        payloads = None
+    if payloads is None:
+        outputs = _run_zsteg_processes(image_arg)
+    else:
+        outputs = [
+            (selector, label, payload.decode("utf-8", errors="replace") if payload else None)
+            for (selector, label), payload in zip(ZSTEG_SELECTORS, payloads)
+        ]
+
+    for selector, label, stdout in outputs:
+        if not stdout:
+            continue
+        text = stdout.strip()
+        # Filter out empty or binary-looking content
+        if text and len(text) > 0 and _is_printable_text(text[:200]):
+            # Get byte representation for hex preview
+            text_bytes = text.encode('utf-8', errors='ignore')
+            hex_preview = text_bytes[:64].hex(" ")
+
+            candidates.append(
+                Candidate(
+                    selector=selector,
+                    label=label,
+                    text=text,
+                    source="zsteg",
+                    bytes_len=len(text_bytes),
+                    hex_preview=hex_preview,
+                )
+            )
+
+    return candidates
+
 
-    for selector, label in selectors:
+def _run_zsteg_processes(image_arg: str) -> List[tuple[str, str, Optional[str]]]:
+    """Run one ``zsteg -E`` process per selector, all side by side."""
+    processes: List[tuple[str, str, subprocess.Popen[str]]] = []
+    for selector, label in ZSTEG_SELECTORS:
         try:
-            result = subprocess.run(
-                ["zsteg", "-E", selector, str(image_path)],
-                capture_output=True,
+            process = subprocess.Popen(
+                ("zsteg", "-E", selector, image_arg),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=10,
-                check=False,
             )
-            if result.returncode == 0 and result.stdout:
-                text = result.stdout.strip()
-                # Filter out empty or binary-looking content
-                if text and len(text) > 0 and _is_printable_text(text[:200]):
-                    # Get byte representation for hex preview
-                    text_bytes = text.encode('utf-8', errors='ignore')
-                    hex_preview = ' '.join(f'{b:02x}' for b in text_bytes[:64])
-
-                    candidates.append({
-                        "selector": selector,
-                        "label": label,
-                        "text": text,
-                        "source": "zsteg",
-                        "bytes_len": len(text_bytes),
-                        "hex_preview": hex_preview,
-                    })
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        except FileNotFoundError:
+            break
+        processes.append((selector, label, process))
+
+    outputs: List[tuple[str, str, Optional[str]]] = []
+    deadline = time.monotonic() + ZSTEG_TIMEOUT
+    for selector, label, process in processes:
+        try:
+            stdout, _ = process.communicate(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
             continue
+        outputs.append((selector, label, stdout if process.returncode == 0 else None))
+    return outputs
 
-    return candidates
+
+_DEDUP_PREFIX_CHARS = 256
 
 
-def _normalize_text(text: str) -> str:
-    """Normalize text for deduplication."""
-    return text.strip().lower()
+def _dedup_key(text: str) -> str:
+    """Normalize a bounded prefix of *text* for deduplication."""
+    return text.lstrip()[:_DEDUP_PREFIX_CHARS].rstrip().casefold()
 
 
-def _deduplicate_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate candidates based on normalized text."""
+def _deduplicate_candidates(candidates: List[Candidate]) -> List[Candidate]:
+    """Remove duplicate candidates based on their normalized leading text."""
     seen = set()
     unique = []
     for candidate in candidates:
-        normalized = _normalize_text(candidate.get("text", ""))
-        if normalized and normalized not in seen:
-            seen.add(normalized)
-            unique.append(candidate)
+        key = _dedup_key(candidate.text)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        unique.append(candidate)
     return unique
 
 
-def _select_best_candidate(candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+def _select_best_candidate(candidates: List[Candidate]) -> Optional[Candidate]:
     """Select the best candidate from the list (longest meaningful text)."""
     if not candidates:
         return None
     # Prefer longer texts as they're more likely to be the intended message
-    return max(candidates, key=lambda c: len(c.get("text", "")))
+    return max(candidates, key=lambda c: len(c.text))
 
 
 def _is_printable_text(text: str) -> bool:
     """Check if text appears to be printable (not binary garbage)."""
     if not text:
         return False
-    printable_chars = sum(1 for c in text if c.isprintable() or c in '\n\r\t')
-    ratio = printable_chars / len(text)
-    return ratio > 0.7
+    total = len(text)
+    if text.isascii():
+        printable_chars = len(text.encode("ascii").translate(None, _NON_PRINTABLE_ASCII))
+        return printable_chars / total > 0.7
+
+    # Bail out as soon as the remaining characters can no longer reach the ratio.
+    non_printable = 0
+    for c in text:
+        if not (c.isprintable() or c in '\n\r\t'):
+            non_printable += 1
+            if (total - non_printable) / total <= 0.7:
+                return False
+    return (total - non_printable) / total > 0.7
 
 
 def _load_results(results_path: Path) -> Dict[str, Any]:
-    if not results_path.exists():
+    try:
+        handle = results_path.open("rb")
+    except FileNotFoundError:
         return {}
-    return json.loads(results_path.read_text(encoding="utf-8"))
+    with handle:
+        return json.load(handle)
 
 
-def _collect_text_lines(results: Dict[str, Any]) -> List[str]:
-    lines: List[str] = []
+def _iter_text_lines(results: Dict[str, Any]) -> Iterator[str]:
+    """Lazily yield every non-empty analyzer output line."""
     for data in results.values():
         output = data.get("output") if isinstance(data, dict) else None
         if isinstance(output, list):
-            lines.extend(str(item) for item in output if item)
-    return lines
+            yield from (str(item) for item in output if item)
+
+
+def _collect_text_lines(results: Dict[str, Any]) -> List[str]:
+    # Results are cached and pickled by the UI, so they carry a materialised list.
+    return list(_iter_text_lines(results))
+
+
+TEXT_SNIPPET_LINES = 50
+
+
+def _list_files(directory: Path) -> Set[str]:
+    """Return the names of the regular files in *directory* from a single scan."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
 
 
 def _resolve_plane_images(output_dir: Path, results: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -287,6 +629,7 @@ def _resolve_plane_images(output_dir: Path, results: Dict[str, Any]) -> List[Dic
     if not isinstance(images, dict):
         return planes
 
+    listings: Dict[Path, Set[str]] = {}
     for group_name, entries in images.items():
         if not isinstance(entries, list):
             continue
@@ -297,23 +640,81 @@ def _resolve_plane_images(output_dir: Path, results: Dict[str, Any]) -> List[Dic
                 continue
             relative = rel[len("/image/") :]
             plane_path = output_dir.parent / relative
-            if not plane_path.exists():
+            existing = listings.get(plane_path.parent)
+            if existing is None:
+                existing = listings[plane_path.parent] = _list_files(plane_path.parent)
+            if plane_path.name not in existing:
                 continue
             image_bytes = plane_path.read_bytes()
-            preview = Image.open(io.BytesIO(image_bytes))
-            preview.load()
             planes.append(
                 {
                     "label": f"{group_name}: {plane_path.name}",
                     "image_bytes": image_bytes,
-                    "pil_image": preview,
+                    "thumb_bytes": _plane_thumbnail(image_bytes),
                 }
             )
     return planes
 
 
+PLANE_THUMBNAIL_SIZE = (320, 320)
+
+
+def _plane_thumbnail(image_bytes: bytes) -> bytes:
+    """Downscale a bit-plane PNG for the gallery, keeping small planes as they are.
+
+    Resampling turns the two-colour planes into continuous tone, so the
+    thumbnail is a JPEG; the full-size PNG stays available for exact viewing.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            if img.width <= PLANE_THUMBNAIL_SIZE[0] and img.height <= PLANE_THUMBNAIL_SIZE[1]:
+                return image_bytes
+            img.thumbnail(PLANE_THUMBNAIL_SIZE)
+            thumb = img if img.mode in ("L", "RGB") else img.convert("RGB")
+            buffer = io.BytesIO()
+            thumb.save(buffer, format="JPEG", quality=80)
+    except Exception:
+        return image_bytes
+    return buffer.getvalue()
+
+
+# Archives outlive the analysis workspace, so they are kept under one bounded root:
+# a directory per analysis, with the least recently used ones swept past the limit. The
+# limit matches the UI's analysis cache, so cached results keep their downloads, and a
+# directory used within the grace period (the UI touches it when it offers the
+# downloads) is never swept.
+ARTIFACT_ROOT = Path(tempfile.gettempdir()) / "eclipsera-artifacts"
+ARTIFACT_ROOT_MAX_ENTRIES = 32
+ARTIFACT_MIN_AGE = 10 * 60
+
+
+def _artifact_mtime(entry: os.DirEntry[str]) -> float:
+    try:
+        return entry.stat(follow_symlinks=False).st_mtime
+    except OSError:  # Swept concurrently by another analysis
+        return 0.0
+
+
+def _artifact_dir() -> Path:
+    """Sweep stale artifact directories and return a fresh one for this analysis."""
+    ARTIFACT_ROOT.mkdir(parents=True, exist_ok=True)
+    with os.scandir(ARTIFACT_ROOT) as scan:
+        entries = [entry for entry in scan if entry.is_dir(follow_symlinks=False)]
+    entries.sort(key=_artifact_mtime, reverse=True)
+    cutoff = time.time() - ARTIFACT_MIN_AGE
+    for stale in entries[ARTIFACT_ROOT_MAX_ENTRIES - 1 :]:
+        if _artifact_mtime(stale) < cutoff:
+            shutil.rmtree(stale.path, ignore_errors=True)
+    # Unique per run: analyses of the same image (deep or not, other sessions) never
+    # share or overwrite each other's archives.
+    return Path(tempfile.mkdtemp(prefix="run-", dir=ARTIFACT_ROOT))
+
+
 def _collect_artifacts(output_dir: Path, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Move analyzer archives out of the workspace and describe them by path."""
     artifacts: List[Dict[str, Any]] = []
+    artifact_dir: Optional[Path] = None
+    existing = _list_files(output_dir)
     for name, data in results.items():
         if not isinstance(data, dict):
             continue
@@ -321,63 +722,76 @@ def _collect_artifacts(output_dir: Path, results: Dict[str, Any]) -> List[Dict[s
         if not isinstance(download, str):
             continue
         stem = download.rsplit("/", 1)[-1]
-        archive_path = output_dir / f"{stem}.7z"
-        if not archive_path.exists():
+        archive_name = f"{stem}.7z"
+        if archive_name not in existing:
             continue
+        if artifact_dir is None:
+            # The analysis workspace is removed on return; keep archives elsewhere.
+            artifact_dir = _artifact_dir()
+        archive_path = Path(shutil.move(output_dir / archive_name, artifact_dir / archive_name))
         artifacts.append(
             {
                 "source": name,
                 "name": archive_path.name,
-                "bytes": archive_path.read_bytes(),
+                "path": str(archive_path),
+                "size": archive_path.stat().st_size,
             }
         )
     return artifacts
 
 
-def _build_summary(results: Dict[str, Any]) -> str:
+def _build_reports(
+    results: Dict[str, Any], output_dir: Path
+) -> tuple[str, List[Dict[str, Any]], List[str]]:
+    """Build the summary, analyzer details and log lines in one sorted pass."""
     parts: List[str] = []
-    for analyzer, data in sorted(results.items()):
-        if not isinstance(data, dict):
-            continue
-        status = data.get("status", "unknown")
-        parts.append(f"{analyzer}: {status}")
-    return "; ".join(parts) if parts else "No analyzers executed"
+    analyzers: List[Dict[str, Any]] = []
+    log_lines: List[str] = []
+    existing = _list_files(output_dir)
 
-
-def _build_analyzer_details(results: Dict[str, Any], output_dir: Path) -> List[Dict[str, Any]]:
-    """Build detailed analyzer information including log paths."""
-    analyzers = []
     for name, data in sorted(results.items()):
         if not isinstance(data, dict):
             continue
 
         status = data.get("status", "unknown")
         reason = data.get("reason", "") or data.get("error", "")
+        parts.append(f"{name}: {status}")
 
         # Look for stdout/stderr files
-        stdout_path = output_dir / f"{name}.stdout"
-        stderr_path = output_dir / f"{name}.stderr"
-
-        analyzer_info = {
-            "name": name,
-            "status": status,
-            "reason": reason,
-            "stdout_path": str(stdout_path) if stdout_path.exists() else None,
-            "stderr_path": str(stderr_path) if stderr_path.exists() else None,
-        }
-        analyzers.append(analyzer_info)
+        stdout_name = f"{name}.stdout"
+        stderr_name = f"{name}.stderr"
+        analyzers.append(
+            {
+                "name": name,
+                "status": status,
+                "reason": reason,
+                "stdout_path": str(output_dir / stdout_name) if stdout_name in existing else None,
+                "stderr_path": str(output_dir / stderr_name) if stderr_name in existing else None,
+            }
+        )
 
-    return analyzers
+        if status == "ok":
+            output = data.get("output")
+            snippet = ", ".join(output[:3]) if isinstance(output, list) else ""
+            log_lines.append(f"[{name}] ok {snippet}")
+        elif status == "skipped":
+            log_lines.append(f"[{name}] skipped: {data.get('reason', 'Not applicable')}")
+        else:
+            log_lines.append(f"[{name}] {status}: {data.get('error', '')}")
 
+    summary = "; ".join(parts) if parts else "No analyzers executed"
+    return summary, analyzers, log_lines
 
-def _build_selectors_hit(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def _build_selectors_hit(candidates: List[Candidate]) -> List[Dict[str, Any]]:
     """Build a list of selectors that produced results."""
     selectors = []
     for candidate in candidates:
         selectors.append({
-            "tool": candidate.get("source", "unknown"),
-            "selector": candidate.get("selector", ""),
-            "bytes_len": candidate.get("bytes_len", 0),
+            "tool": candidate.source,
+            "selector": candidate.selector,
+            "bytes_len": candidate.bytes_len,
+            "hex_preview": candidate.hex_preview,
         })
     return selectors
 
@@ -386,8 +800,13 @@ def analyze_image(
     image_bytes: bytes,
     *,
     options: DecoderOptions | Dict[str, Any] | None = None,
+    rgba_image: Optional[Image.Image] = None,
 ) -> Dict[str, Any]:
-    """Execute the vendor analyzers and collate their results."""
+    """Execute the vendor analyzers and collate their results.
+
+    Callers that have already decoded *image_bytes* may pass the RGBA image
+    as *rgba_image* so the built-in LSB probe does not decode it again.
+    """
 
     if not image_bytes:
         raise ValueError("An image is required for analysis.")
@@ -399,9 +818,10 @@ def analyze_image(
     image_name = _sanitise_filename(opts.filename)
 
     supplemental_results: Dict[str, Dict[str, Any]] = {}
-    is_png = _detect_png(image_bytes)
+    image_format = _detect_format(image_bytes)
+    is_png = image_format == "PNG"
 
-    with tempfile.TemporaryDirectory(prefix="eclipsera-decode-") as tmp:
+    with temporary_workspace("eclipsera-decode-") as tmp:
         tmp_path = Path(tmp)
         output_dir = tmp_path / "analysis"
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -439,67 +859,66 @@ def analyze_image(
                 ("outguess", analyze_outguess, (image_path, output_dir, opts.password))
             )
 
-        for name, func, func_args in analyzers:
-            try:
-                func(*func_args)
-            except FileNotFoundError as exc:
-                supplemental_results[name] = {
-                    "status": "error",
-                    "error": f"Dependency missing: {exc}",
-                }
-            except Exception as exc:  # pragma: no cover - defensive path
-                supplemental_results[name] = {
-                    "status": "error",
-                    "error": str(exc),
-                }
+        # The analyzers are independent subprocess-bound tools that each write to
+        # their own files; the shared results.json is updated under a lock by the
+        # vendor helper, so they can safely run side by side.
+        recovered_texts: List[Candidate] = []
+        with ThreadPoolExecutor(max_workers=len(analyzers) + 1) as executor:
+            futures = {
+                executor.submit(func, *func_args): name for name, func, func_args in analyzers
+            }
+            zsteg_future = executor.submit(_extract_with_zsteg, image_path) if is_png else None
 
-        # Attempt targeted extraction for PNG images
-        recovered_texts: List[Dict[str, Any]] = []
-        if is_png:
-            # First attempt built-in LSB extraction before falling back to vendor tooling.
-            recovered_texts.extend(_extract_lsb_planes(image_path))
-            recovered_texts.extend(_extract_with_zsteg(image_path))
+            # Attempt targeted extraction for PNG images
+            if is_png:
+                # First attempt built-in LSB extraction before falling back to vendor tooling.
+                recovered_texts.extend(_extract_lsb_planes(image_path, rgba_image))
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                except FileNotFoundError as exc:
+                    supplemental_results[name] = {
+                        "status": "error",
+                        "error": f"Dependency missing: {exc}",
+                    }
+                except Exception as exc:  # pragma: no cover - defensive path
+                    supplemental_results[name] = {
+                        "status": "error",
+                        "error": str(exc),
+                    }
+
+            if zsteg_future is not None:
+                recovered_texts.extend(zsteg_future.result())
 
         results_path = output_dir / "results.json"
         results = _load_results(results_path)
         results.update(supplemental_results)
 
         # Extract metadata
-        meta = _extract_meta(image_bytes)
+        meta = _extract_meta(image_bytes, image_format)
 
         # Deduplicate candidates and select best
         candidates = _deduplicate_candidates(recovered_texts)
         best_candidate = _select_best_candidate(candidates)
 
         # Build analyzer details
-        analyzers = _build_analyzer_details(results, output_dir)
+        summary, analyzers, log_lines = _build_reports(results, output_dir)
         selectors_hit = _build_selectors_hit(candidates)
 
         planes = _resolve_plane_images(output_dir, results)
         artifacts = _collect_artifacts(output_dir, results)
-        summary = _build_summary(results)
         text_lines = _collect_text_lines(results)
 
-        log_lines: List[str] = []
-        for analyzer, data in sorted(results.items()):
-            if not isinstance(data, dict):
-                continue
-            status = data.get("status", "unknown")
-            if status == "ok":
-                output = data.get("output")
-                snippet = ", ".join(output[:3]) if isinstance(output, list) else ""
-                log_lines.append(f"[{analyzer}] ok {snippet}")
-            elif status == "skipped":
-                reason = data.get("reason", "Not applicable")
-                log_lines.append(f"[{analyzer}] skipped: {reason}")
-            else:
-                log_lines.append(f"[{analyzer}] {status}: {data.get('error', '')}")
+        # Convert each record once; candidates share dicts with recovered_texts.
+        as_dicts = {id(candidate): candidate.to_dict() for candidate in recovered_texts}
 
         return {
             # New structured fields
             "meta": meta,
-            "best_candidate": best_candidate,
-            "candidates": candidates,
+            "best_candidate": as_dicts[id(best_candidate)] if best_candidate else None,
+            "candidates": [as_dicts[id(candidate)] for candidate in candidates],
             "analyzers": analyzers,
             "selectors_hit": selectors_hit,
             "bitplane_path": str(image_path),  # For lazy bitplane generation
@@ -510,5 +929,6 @@ def analyze_image(
             "logs": "\n".join(log_lines),
             "results": results,
             "text_lines": text_lines,
-            "recovered_texts": recovered_texts,
+            "text_snippet": "\n".join(text_lines[:TEXT_SNIPPET_LINES]),
+            "recovered_texts": list(as_dicts.values()),
         }
@@ -6,29 +6,41 @@ import importlib.util
 import io
 import shutil
 import sys
-import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
 from PIL import Image
 
+from app.adapters.workspace import temporary_workspace
+
 # Load the vendor encoder module without modifying its source.
 VENDOR_ENCODER_DIR = Path(__file__).resolve().parents[2] / "vendor" / "encoder"
-_SPEC = importlib.util.spec_from_file_location(
-    "eclipsera_vendor_encoder", VENDOR_ENCODER_DIR / "app.py"
-)
-if _SPEC is None or _SPEC.loader is None:  # pragma: no cover - defensive guard
-    raise ImportError("Unable to load vendor encoder module.")
-_VENDOR_ENCODER = importlib.util.module_from_spec(_SPEC)
-sys.modules.setdefault("eclipsera_vendor_encoder", _VENDOR_ENCODER)
-_SPEC.loader.exec_module(_VENDOR_ENCODER)
+_VENDOR_MODULE_NAME = "eclipsera_vendor_encoder"
+if _VENDOR_MODULE_NAME in sys.modules:
+    # Already executed (e.g. this adapter was reloaded); reuse it as-is.
+    _VENDOR_ENCODER = sys.modules[_VENDOR_MODULE_NAME]
+else:
+    _SPEC = importlib.util.spec_from_file_location(
+        _VENDOR_MODULE_NAME, VENDOR_ENCODER_DIR / "app.py"
+    )
+    if _SPEC is None or _SPEC.loader is None:  # pragma: no cover - defensive guard
+        raise ImportError("Unable to load vendor encoder module.")
+    _VENDOR_ENCODER = importlib.util.module_from_spec(_SPEC)
+    sys.modules[_VENDOR_MODULE_NAME] = _VENDOR_ENCODER
+    try:
+        _SPEC.loader.exec_module(_VENDOR_ENCODER)
+    except BaseException:
+        del sys.modules[_VENDOR_MODULE_NAME]
+        raise
 
 # Re-export the functions we need so we can call them verbatim.
 compress_image_before_encoding = _VENDOR_ENCODER.compress_image_before_encoding
 encode_text_into_plane = _VENDOR_ENCODER.encode_text_into_plane
 encode_zlib_into_image = _VENDOR_ENCODER.encode_zlib_into_image
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
 
 @dataclass
 class EncoderOptions:
@@ -82,13 +94,17 @@ def encode_text_to_image(
     if opts is None:
         opts = EncoderOptions()
 
-    with tempfile.TemporaryDirectory(prefix="eclipsera-encode-") as tmp:
+    with temporary_workspace("eclipsera-encode-") as tmp:
         tmp_path = Path(tmp)
         cover_path = tmp_path / "cover.png"
 
         # Normalize the user-provided image to PNG so the vendor helper can work with it.
-        with Image.open(io.BytesIO(cover_image_bytes)) as img:
-            img.save(cover_path, format="PNG")
+        if cover_image_bytes[:8] == PNG_SIGNATURE:
+            cover_path.write_bytes(cover_image_bytes)
+        else:
+            # The vendor encoder re-saves the image, so a fast deflate is enough here.
+            with Image.open(io.BytesIO(cover_image_bytes)) as img:
+                img.save(cover_path, format="PNG", optimize=False, compress_level=1)
 
         working_path = tmp_path / "working.png"
 
@@ -117,14 +133,9 @@ def encode_text_to_image(
                     plane=plane,
                 )
 
-        encoded_bytes = working_path.read_bytes()
-        preview = Image.open(io.BytesIO(encoded_bytes))
-        preview.load()
-
         return {
             "filename": opts.output_basename,
-            "image_bytes": encoded_bytes,
-            "pil_image": preview,
+            "image_bytes": working_path.read_bytes(),
             "plane": plane,
             "options_applied": {
                 "twitter_safe": opts.twitter_safe,
@@ -0,0 +1,35 @@
+"""Scratch directories for the adapter pipelines."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+# Prefer tmpfs so the many small files written by the tools never touch disk.
+_SHM_DIR = "/dev/shm"
+# Docker caps /dev/shm at 64 MiB by default, too little for a decode's tool output, so
+# tmpfs is only used when it has at least this much room; otherwise the system temp dir.
+SHM_MIN_FREE_BYTES = 256 * 1024 * 1024
+
+
+def _workspace_root() -> Optional[str]:
+    """Return /dev/shm when it is writable and roomy enough, else None (the temp dir)."""
+    try:
+        if os.access(_SHM_DIR, os.W_OK) and shutil.disk_usage(_SHM_DIR).free >= SHM_MIN_FREE_BYTES:
+            return _SHM_DIR
+    except OSError:
+        pass
+    return None
+
+
+def temporary_workspace(prefix: str) -> tempfile.TemporaryDirectory[str]:
+    """Return a self-cleaning scratch directory, RAM-backed when available."""
+    root = _workspace_root()
+    if root is not None:
+        try:
+            return tempfile.TemporaryDirectory(prefix=prefix, dir=root)
+        except OSError:
+            pass
+    return tempfile.TemporaryDirectory(prefix=prefix, dir=tempfile.gettempdir())
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
 from pathlib import Path
 from typing import Any, Dict
 
 import streamlit as st
+from PIL import Image
 
-from app.adapters.decoder_adapter import DecoderOptions, analyze_image
-from app.adapters.encoder_adapter import EncoderOptions, encode_text_to_image
 from app.ui.components import (
+    PREVIEW_WIDTH,
     inject_css,
     render_all_candidates,
     render_analyzer_status_table,
@@ -29,6 +30,80 @@ from app.ui.components import (
     render_text_findings,
 )
 
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _analyze_image_cached(
+    image_hash: bytes,
+    _image_bytes: bytes,
+    options_key: tuple[str, str | None, bool],
+) -> Dict[str, Any]:
+    """Run the decoder once per image/options pair; reruns are served from cache."""
+    # Imported here so the vendor decoder only loads once an analysis is requested.
+    from app.adapters.decoder_adapter import DecoderOptions, analyze_image
+
+    filename, password, deep = options_key
+    return analyze_image(
+        _image_bytes,
+        options=DecoderOptions(filename=filename, password=password, deep=deep),
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _encode_text_cached(
+    image_hash: bytes,
+    _cover_bytes: bytes,
+    message: str,
+    options_key: tuple[bool, bool, tuple[str, ...] | None, bool, str],
+) -> Dict[str, Any]:
+    """Embed once per cover/message/options combination; repeats come from cache."""
+    # Imported here so the vendor encoder only loads once an encode is requested.
+    from app.adapters.encoder_adapter import EncoderOptions, encode_text_to_image
+
+    twitter_safe, lsb_overall, channels, zlib, output_basename = options_key
+    return encode_text_to_image(
+        _cover_bytes,
+        message,
+        options=EncoderOptions(
+            twitter_safe=twitter_safe,
+            lsb_overall=lsb_overall,
+            channels=list(channels) if channels is not None else None,
+            zlib=zlib,
+            output_basename=output_basename,
+        ),
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _upload_record(file_id: str, _uploaded_file: Any) -> Dict[str, Any]:
+    """Materialise an upload's bytes, digest and names once per file_id.
+
+    cache_resource hands back the same (immutable) bytes object on every rerun
+    instead of unpickling a fresh copy the way cache_data would.
+    """
+    data = _uploaded_file.getvalue()
+    return {
+        "bytes": data,
+        "hash": hashlib.blake2b(data, digest_size=16).digest(),
+        "filename": _uploaded_file.name,
+        "stem": Path(_uploaded_file.name).stem,
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _upload_preview(image_hash: bytes, _image_bytes: bytes) -> Dict[str, Any] | None:
+    """Decode an upload once into a JPEG thumbnail plus its basic metadata."""
+    try:
+        with Image.open(io.BytesIO(_image_bytes)) as img:
+            preview = {"format": img.format, "width": img.width, "height": img.height}
+            img.thumbnail((512, 512))
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, format="JPEG", quality=80)
+    except Exception:
+        return None
+    preview["thumbnail"] = buf.getvalue()
+    return preview
+
+
 st.set_page_config(page_title="eclipsera", page_icon="🌘", layout="wide")
 inject_css()
 
@@ -43,21 +118,27 @@ uploaded_file = st.file_uploader(
     help="Use the same image for encrypting or decrypting hidden payloads.",
 )
 
+upload = _upload_record(uploaded_file.file_id, uploaded_file) if uploaded_file else None
+cover_bytes: bytes | None = upload["bytes"] if upload else None
+upload_hash: bytes = upload["hash"] if upload else b""
+filename: str = upload["filename"] if upload else "upload.png"
+studio_stem: str = upload["stem"] if upload else Path(filename).stem
+
 # Show thumbnail preview when file is uploaded
-if uploaded_file:
+if uploaded_file and cover_bytes is not None:
+    preview = _upload_preview(upload_hash, cover_bytes)
     col_preview, col_meta = st.columns([1, 2])
     with col_preview:
-        st.image(uploaded_file, caption="Uploaded image", use_column_width=True)
+        st.image(
+            preview["thumbnail"] if preview else cover_bytes,
+            caption="Uploaded image",
+            width=PREVIEW_WIDTH,
+        )
     with col_meta:
-        from PIL import Image
-        img_bytes = uploaded_file.getvalue()
-        try:
-            with Image.open(io.BytesIO(img_bytes)) as img:
-                st.caption(f"**Format:** {img.format}")
-                st.caption(f"**Size:** {img.width} × {img.height}")
-                st.caption(f"**File size:** {len(img_bytes) / 1024:.1f} KB")
-        except Exception:
-            pass
+        if preview:
+            st.caption(f"**Format:** {preview['format']}")
+            st.caption(f"**Size:** {preview['width']} × {preview['height']}")
+            st.caption(f"**File size:** {len(cover_bytes) / 1024:.1f} KB")
 
 disabled = uploaded_file is None
 
@@ -75,10 +156,6 @@ if "encode_result" not in st.session_state:
 if "decode_result" not in st.session_state:
     st.session_state["decode_result"] = None
 
-cover_bytes: bytes | None = uploaded_file.getvalue() if uploaded_file else None
-filename = uploaded_file.name if uploaded_file else "upload.png"
-studio_stem = Path(filename).stem
-
 st.markdown("---")
 
 if mode == "Encrypt":
@@ -121,17 +198,11 @@ if mode == "Encrypt":
                 message = text_to_hide or ""
                 if not message.strip():
                     raise ValueError("Please enter a message to hide.")
-                options = EncoderOptions(
-                    twitter_safe=twitter_safe,
-                    lsb_overall=lsb_overall,
-                    channels=None,
-                    zlib=False,
-                    output_basename=f"{studio_stem}_encoded.png",
-                )
-                result = encode_text_to_image(
+                result = _encode_text_cached(
+                    upload_hash,
                     cover_bytes,
                     message,
-                    options=options,
+                    (twitter_safe, lsb_overall, None, False, f"{studio_stem}_encoded.png"),
                 )
             except ValueError as exc:
                 st.warning(str(exc))
@@ -145,10 +216,12 @@ if mode == "Encrypt":
 
     encode_result: Dict[str, Any] | None = st.session_state.get("encode_result")
     if encode_result:
+        # Sent inline rather than published: the static folder is public, and this
+        # image carries the hidden message.
         st.image(
             encode_result["image_bytes"],
             caption=f"Encoded preview — plane {encode_result['plane']}",
-            use_column_width=True,
+            width=2 * PREVIEW_WIDTH,
         )
         st.download_button(
             "Download encoded image",
@@ -183,12 +256,11 @@ else:  # Decrypt
             st.warning("Please upload an image to analyze.")
         else:
             try:
-                options = DecoderOptions(
-                    filename=filename,
-                    password=password or None,
-                    deep=deep_analysis,
+                result = _analyze_image_cached(
+                    upload_hash,
+                    cover_bytes,
+                    (filename, password or None, deep_analysis),
                 )
-                result = analyze_image(cover_bytes, options=options)
             except ValueError as exc:
                 st.warning(str(exc))
                 st.session_state["decode_result"] = None
@@ -258,6 +330,8 @@ else:  # Decrypt
         # Legacy views (for backward compatibility, hidden in expander)
         with st.expander("🔧 Legacy views", expanded=False):
             render_analyzer_status_table(decode_result.get("results", {}))
-            render_text_findings(decode_result.get("text_lines", []))
+            render_text_findings(
+                decode_result.get("text_lines", []), snippet=decode_result.get("text_snippet")
+            )
             render_plane_gallery(decode_result.get("planes", []))
             render_artifact_downloads(decode_result.get("artifacts", []))
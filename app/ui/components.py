@@ -3,23 +3,105 @@
 from __future__ import annotations
 
 import base64
+import contextlib
+import hashlib
+import html
 import io
+import os
 import subprocess
+import time
+import zipfile
 import zlib
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 import streamlit as st
 from PIL import Image
 
 
+CSS_PATH = Path(__file__).with_name("styles.css")
+
+# Fixed display width (px) for gallery and upload previews.
+PREVIEW_WIDTH = 320
+
+# zlib level for PNGs generated on the fly; they are shown once and discarded.
+UI_PNG_COMPRESS_LEVEL = 1
+
+# Longest side of generated bit-plane previews; NEAREST keeps the masks pure 0/255.
+UI_PREVIEW_MAX_SIDE = 1024
+
+# Served by Streamlit's static file server (server.enableStaticServing) as app/static/.
+STATIC_DIR = Path(__file__).resolve().parents[1] / "static"
+STATIC_IMAGE_DIR = STATIC_DIR / "previews"
+# Published previews are public; keep them short-lived and the directory bounded.
+STATIC_IMAGE_MAX_AGE = 60 * 60
+STATIC_IMAGE_MAX_BYTES = 256 * 1024 * 1024
+
+
+@st.cache_data(show_spinner=False)
+def _load_css(path: str, mtime: float) -> str:
+    """Read the stylesheet; *mtime* is only part of the cache key."""
+    return Path(path).read_text(encoding="utf-8")
+
+
 def inject_css() -> None:
     """Load the app-specific CSS into the current Streamlit page."""
-    css_path = Path(__file__).with_name("styles.css")
-    css = css_path.read_text(encoding="utf-8")
+    css = _load_css(str(CSS_PATH), CSS_PATH.stat().st_mtime)
     st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 
+def _sweep_static_images() -> None:
+    """Drop previews unused for STATIC_IMAGE_MAX_AGE, then the oldest past the size cap."""
+    try:
+        with os.scandir(STATIC_IMAGE_DIR) as scan:
+            files = [(entry.stat(), entry.path) for entry in scan]
+    except OSError:
+        return
+    files.sort(key=lambda item: item[0].st_mtime, reverse=True)
+    cutoff = time.time() - STATIC_IMAGE_MAX_AGE
+    total = 0
+    for stat, path in files:
+        total += stat.st_size
+        if stat.st_mtime < cutoff or total > STATIC_IMAGE_MAX_BYTES:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+
+def _publish_static_image(digest: str, image_bytes: bytes) -> str:
+    """Write a PNG or JPEG into the static directory if needed and return its relative URL.
+
+    Every use refreshes the file's mtime; files nobody asked for within the age
+    limit, or beyond the size cap, are swept whenever a new one is written.
+    """
+    suffix = ".jpg" if image_bytes[:3] == b"\xff\xd8\xff" else ".png"
+    name = f"{digest}{suffix}"
+    target = STATIC_IMAGE_DIR / name
+    try:
+        os.utime(target)
+    except FileNotFoundError:
+        STATIC_IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+        staging = target.with_suffix(f".{os.getpid()}.tmp")
+        staging.write_bytes(image_bytes)
+        os.replace(staging, target)
+        _sweep_static_images()
+    return f"app/static/{STATIC_IMAGE_DIR.name}/{name}"
+
+
+def render_static_image(
+    image_bytes: bytes, *, caption: str, width: int = PREVIEW_WIDTH, container: Any = st
+) -> None:
+    """Show a PNG/JPEG through the static server so reruns don't resend its bytes."""
+    digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+    url = _publish_static_image(digest, image_bytes)
+    container.markdown(
+        f'<img src="{url}" width="{width}" alt="{html.escape(caption)}">',
+        unsafe_allow_html=True,
+    )
+    container.caption(caption)
+
+
 def render_plane_gallery(planes: Iterable[dict]) -> None:
     planes = list(planes)
     if not planes:
@@ -32,11 +114,28 @@ def render_plane_gallery(planes: Iterable[dict]) -> None:
         row = planes[index : index + cols_per_row]
         columns = st.columns(len(row))
         for column, plane in zip(columns, row):
-            column.image(
-                plane["image_bytes"],
-                caption=plane["label"],
-                use_column_width=True,
-            )
+            image_bytes = plane["image_bytes"]
+            thumb_bytes = plane.get("thumb_bytes") or image_bytes
+            render_static_image(thumb_bytes, caption=plane["label"], container=column)
+            if thumb_bytes != image_bytes:
+                digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+                column.markdown(f"[Full resolution]({_publish_static_image(digest, image_bytes)})")
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _zip_artifacts(entries: tuple[tuple[str, str, int], ...]) -> str:
+    """Zip artifact files next to the first one and return the bundle's path.
+
+    *entries* are (arcname, path, size). The bundle lives on disk so no
+    artifact bytes stay resident between reruns; it is named after the entries
+    so different sets never overwrite each other's bundle.
+    """
+    digest = hashlib.blake2b(repr(entries).encode(), digest_size=8).hexdigest()
+    bundle_path = Path(entries[0][1]).with_name(f"artifacts-{digest}.zip")
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as bundle:
+        for arcname, path, _size in entries:
+            bundle.write(path, arcname=arcname)
+    return str(bundle_path)
 
 
 def render_artifact_downloads(artifacts: Iterable[dict]) -> None:
@@ -46,25 +145,49 @@ def render_artifact_downloads(artifacts: Iterable[dict]) -> None:
         return
 
     st.subheader("Extracted artifacts")
+    entries = []
     for artifact in artifacts:
-        label = f"Download {artifact['name']} ({artifact['source']})"
+        if os.path.exists(artifact["path"]):
+            entries.append(
+                (f"{artifact['source']}/{artifact['name']}", artifact["path"], artifact["size"])
+            )
+        else:
+            st.caption(f"{artifact['name']} is no longer available.")
+    if not entries:
+        return
+    # Mark the artifact directories as in use so the decoder's sweep leaves them alone.
+    for directory in {os.path.dirname(path) for _, path, _ in entries}:
+        with contextlib.suppress(OSError):
+            os.utime(directory)
+
+    st.caption("\n".join(f"- `{arcname}` ({size / 1024:.1f} KB)" for arcname, _, size in entries))
+    try:
+        # Streamlit buffers the whole bundle when given a handle; closed once passed on.
+        handle = open(_zip_artifacts(tuple(entries)), "rb")
+    except OSError:
+        st.caption("The artifact bundle is no longer available.")
+        return
+    with handle:
         st.download_button(
-            label,
-            data=artifact["bytes"],
-            file_name=artifact["name"],
-            mime="application/x-7z-compressed",
-            key=f"artifact-{artifact['source']}-{artifact['name']}",
+            f"Download all artifacts ({len(entries)} files, zip)",
+            data=handle,
+            file_name="artifacts.zip",
+            mime="application/zip",
+            key="artifact-bundle",
         )
 
 
-def render_text_findings(text_lines: Iterable[str], *, header: str = "Text findings") -> None:
-    lines = [line for line in text_lines if line]
-    if not lines:
+def render_text_findings(
+    text_lines: Iterable[str], *, header: str = "Text findings", snippet: Optional[str] = None
+) -> None:
+    """Show the first 50 text lines; pass the decoder's precomputed *snippet* when available."""
+    if snippet is None:
+        snippet = "\n".join(islice((line for line in text_lines if line), 50))
+    if not snippet:
         st.caption("No candidate text snippets detected yet.")
         return
 
     st.subheader(header)
-    snippet = "\n".join(lines[:50])
     st.code(snippet)
 
 
@@ -154,38 +277,61 @@ def render_all_candidates(result: Dict[str, Any]) -> None:
             )
 
 
-def _generate_lsb_visualization(image_path: Path | str | None, channels: Iterable[str]) -> Optional[bytes]:
-    """Generate a binary visualization for the provided channels' LSB."""
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_rgba(path: str, mtime: float, size: int) -> np.ndarray:
+    """Decode an image to a read-only RGBA array; *mtime* and *size* only key the cache.
+
+    cache_resource shares the one array between reruns and helpers instead of
+    unpickling a copy, so it is frozen to keep callers from mutating it.
+    """
+    with Image.open(path) as src:
+        arr = np.asarray(src.convert("RGBA"), dtype=np.uint8)
+    arr.setflags(write=False)
+    return arr
 
-    if image_path is None:
-        return None
 
+def _rgba_array(image_path: Path | str | None) -> Optional[np.ndarray]:
+    """Return the cached RGBA array for *image_path*, or None if it can't be read."""
+    if not image_path:
+        return None
     try:
-        with Image.open(image_path) as src:
-            img = src.convert("RGBA")
+        stat = os.stat(image_path)
+        return _load_rgba(str(image_path), stat.st_mtime, stat.st_size)
     except Exception:
         return None
 
-    width, height = img.size
-    plane_img = Image.new("L", (width, height))
-    pixels = plane_img.load()
+
+def _bit_mask(rgba: np.ndarray, indices: Sequence[int], bit: int) -> np.ndarray:
+    """0/255 mask of the pixels whose *bit* is set in any of the channels at *indices*."""
+    if len(indices) == 1:
+        hits = (rgba[..., indices[0]] >> bit) & 1
+    else:
+        hits = np.any((rgba[..., indices] >> bit) & 1, axis=-1)
+    return hits.astype(np.uint8) * np.uint8(255)
+
+
+def _mask_png(mask: np.ndarray) -> bytes:
+    """Encode a 0/255 mask as a preview PNG no larger than UI_PREVIEW_MAX_SIDE."""
+    plane_img = Image.fromarray(mask, "L")
+    plane_img.thumbnail((UI_PREVIEW_MAX_SIDE, UI_PREVIEW_MAX_SIDE), resample=Image.NEAREST)
+    buf = io.BytesIO()
+    plane_img.save(buf, format="PNG", compress_level=UI_PNG_COMPRESS_LEVEL, optimize=False)
+    return buf.getvalue()
+
+
+def _generate_lsb_visualization(rgba: Optional[np.ndarray], channels: Iterable[str]) -> Optional[bytes]:
+    """Generate a binary visualization for the provided channels' LSB."""
+
+    if rgba is None:
+        return None
 
     channel_map = {"R": 0, "G": 1, "B": 2, "A": 3}
     indices = [channel_map[ch.upper()] for ch in channels if ch.upper() in channel_map]
     if not indices:
         return None
 
-    for y in range(height):
-        for x in range(width):
-            pixel = img.getpixel((x, y))
-            bits = [(pixel[idx] & 1) for idx in indices]
-            value = 255 if any(bits) else 0
-            pixels[x, y] = value
-
     try:
-        buf = io.BytesIO()
-        plane_img.save(buf, format="PNG")
-        return buf.getvalue()
+        return _mask_png(_bit_mask(rgba, indices, 0))
     except Exception:
         return None
 
@@ -200,18 +346,13 @@ def render_lsb_breakdown(result: Dict[str, Any]) -> None:
         if candidate.get("source") == "lsb"
     }
 
-    image_path = result.get("bitplane_path")
-    image_path_obj = None
-    if image_path:
-        candidate_path = Path(image_path)
-        if candidate_path.exists():
-            image_path_obj = candidate_path
+    rgba = _rgba_array(result.get("bitplane_path"))
 
     st.subheader("LSB analysis")
 
     def render_section(title: str, selector_keys: Iterable[str], channels: Iterable[str], key_suffix: str) -> None:
         candidate = next((lsb_candidates.get(key) for key in selector_keys if key in lsb_candidates), None)
-        image_bytes = _generate_lsb_visualization(image_path_obj, channels)
+        image_bytes = _generate_lsb_visualization(rgba, channels)
 
         st.markdown(f"**{title}**")
         if image_bytes:
@@ -238,34 +379,32 @@ def render_lsb_breakdown(result: Dict[str, Any]) -> None:
     render_section("B plane", ["B"], ["B"], "b")
 
 
-def render_recovered_text(recovered_texts: Iterable[dict]) -> None:
+def render_recovered_text(recovered_texts: Sequence[dict]) -> None:
     """Display recovered text from targeted extraction (e.g., zsteg) - legacy format."""
-    texts = list(recovered_texts)
-    if not texts:
+    if not recovered_texts:
         return
 
     st.subheader("🔓 Recovered Text")
     st.success("Hidden message(s) detected!")
 
-    for candidate in texts:
+    for candidate in recovered_texts:
         label = candidate.get("label", "Unknown")
         selector = candidate.get("selector", "")
         text = candidate.get("text", "")
 
-        with st.expander(f"{label} ({selector})", expanded=(len(texts) == 1)):
+        with st.expander(f"{label} ({selector})", expanded=(len(recovered_texts) == 1)):
             st.code(text, language=None)
 
 
-def render_diagnostics(recovered_texts: Iterable[dict]) -> None:
+def render_diagnostics(recovered_texts: Sequence[dict]) -> None:
     """Display technical diagnostics about where text was found."""
-    texts = list(recovered_texts)
-    if not texts:
+    if not recovered_texts:
         return
 
     with st.expander("🔬 Diagnostics", expanded=False):
         st.caption("Technical details about recovered data")
 
-        for candidate in texts:
+        for candidate in recovered_texts:
             label = candidate.get("label", "Unknown")
             selector = candidate.get("selector", "")
             bytes_len = candidate.get("bytes_len", 0)
@@ -285,52 +424,30 @@ def render_analyzer_status_table(results: dict) -> None:
 
     st.subheader("📊 Analyzer Status")
 
-    # Group by status
-    ok_analyzers = []
-    skipped_analyzers = []
-    error_analyzers = []
-
+    icons = {"ok": "✅", "skipped": "⏭️"}
+    rows = []
+    counts = {"ok": 0, "skipped": 0, "error": 0}
     for analyzer, data in sorted(results.items()):
         if not isinstance(data, dict):
             continue
 
         status = data.get("status", "unknown")
         reason = data.get("reason", "") or data.get("error", "")
-
-        if status == "ok":
-            ok_analyzers.append(analyzer)
-        elif status == "skipped":
-            skipped_analyzers.append((analyzer, reason))
-        else:
-            error_analyzers.append((analyzer, reason))
+        counts[status if status in icons else "error"] += 1
+        rows.append({"Status": icons.get(status, "❌"), "Analyzer": analyzer, "Reason": reason})
 
     # Display in a compact format
     col1, col2, col3 = st.columns(3)
+    col1.metric("✅ Successful", counts["ok"])
+    col2.metric("⏭️ Skipped", counts["skipped"])
+    col3.metric("❌ Errors", counts["error"])
 
-    with col1:
-        st.metric("✅ Successful", len(ok_analyzers))
-        if ok_analyzers:
-            with st.expander("Details", expanded=False):
-                for analyzer in ok_analyzers:
-                    st.text(f"• {analyzer}")
+    if rows:
+        st.dataframe(rows, hide_index=True, use_container_width=True)
 
-    with col2:
-        st.metric("⏭️ Skipped", len(skipped_analyzers))
-        if skipped_analyzers:
-            with st.expander("Details", expanded=False):
-                for analyzer, reason in skipped_analyzers:
-                    st.text(f"• {analyzer}")
-                    if reason:
-                        st.caption(f"  {reason}")
 
-    with col3:
-        st.metric("❌ Errors", len(error_analyzers))
-        if error_analyzers:
-            with st.expander("Details", expanded=True):
-                for analyzer, reason in error_analyzers:
-                    st.text(f"• {analyzer}")
-                    if reason:
-                        st.caption(f"  {reason}")
+def _join_trimmed(first: List[str], last: List[str], trimmed_count: int) -> str:
+    return "\n".join(first) + f"\n\n... [{trimmed_count} lines omitted] ...\n\n" + "\n".join(last)
 
 
 def _trim_log(log_content: str, max_lines: int = 150) -> str:
@@ -343,7 +460,42 @@ def _trim_log(log_content: str, max_lines: int = 150) -> str:
     last = lines[-max_lines:]
     trimmed_count = len(lines) - (max_lines * 2)
 
-    return "\n".join(first) + f"\n\n... [{trimmed_count} lines omitted] ...\n\n" + "\n".join(last)
+    return _join_trimmed(first, last, trimmed_count)
+
+
+# Large logs are trimmed from this much of their head and tail instead of read whole.
+_LOG_WINDOW_BYTES = 64 * 1024
+
+
+def _decode_log(data: bytes) -> str:
+    # Match text-mode reads: "\r\n" and lone "\r" both end a line.
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _read_trimmed_log(path: str, max_lines: int = 150) -> str:
+    """Return the ``_trim_log`` view of a log file without loading large files whole."""
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size > 2 * _LOG_WINDOW_BYTES:
+            head = handle.read(_LOG_WINDOW_BYTES)
+            breaks = 0
+            pending_cr = False
+            for chunk in chain((head,), iter(lambda: handle.read(1 << 20), b"")):
+                breaks += chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+                # A "\r\n" split across two chunks was counted twice.
+                if pending_cr and chunk.startswith(b"\n"):
+                    breaks -= 1
+                pending_cr = chunk.endswith(b"\r")
+            handle.seek(size - _LOG_WINDOW_BYTES)
+            first = _decode_log(head).split("\n")
+            last = _decode_log(handle.read()).split("\n")
+            # Only trust the windows when each holds enough complete lines.
+            if breaks + 1 > max_lines * 2 and len(first) > max_lines and len(last) > max_lines:
+                return _join_trimmed(
+                    first[:max_lines], last[-max_lines:], breaks + 1 - max_lines * 2
+                )
+            handle.seek(0)
+        return _trim_log(_decode_log(handle.read()), max_lines)
 
 
 def render_analyzers_table(result: Dict[str, Any]) -> None:
@@ -375,61 +527,48 @@ def render_analyzers_table(result: Dict[str, Any]) -> None:
                 st.caption(f"Reason: {reason}")
 
             # Show trimmed logs if available
-            if stdout_path:
+            for stream, log_path in (("stdout", stdout_path), ("stderr", stderr_path)):
+                if not log_path:
+                    continue
                 try:
-                    stdout = Path(stdout_path).read_text(encoding="utf-8", errors="ignore")
-                    if stdout.strip():
-                        st.text("stdout (trimmed):")
-                        st.code(_trim_log(stdout, 150), language=None)
-                        st.download_button(
-                            "Download full stdout",
-                            data=stdout,
-                            file_name=f"{name}_stdout.log",
-                            mime="text/plain",
-                            key=f"download-stdout-{name}",
-                        )
+                    trimmed = _read_trimmed_log(log_path, 150)
+                    if trimmed.strip():
+                        st.text(f"{stream} (trimmed):")
+                        st.code(trimmed, language=None)
+                        # Streamlit reads the whole handle into memory on every rerun, so
+                        # this only avoids decoding the log; the handle is closed here.
+                        with open(log_path, "rb") as handle:
+                            st.download_button(
+                                f"Download full {stream}",
+                                data=handle,
+                                file_name=f"{name}_{stream}.log",
+                                mime="text/plain",
+                                key=f"download-{stream}-{name}",
+                            )
                 except Exception:
                     pass
 
-            if stderr_path:
-                try:
-                    stderr = Path(stderr_path).read_text(encoding="utf-8", errors="ignore")
-                    if stderr.strip():
-                        st.text("stderr (trimmed):")
-                        st.code(_trim_log(stderr, 150), language=None)
-                        st.download_button(
-                            "Download full stderr",
-                            data=stderr,
-                            file_name=f"{name}_stderr.log",
-                            mime="text/plain",
-                            key=f"download-stderr-{name}",
-                        )
-                except Exception:
-                    pass
 
-
-def _generate_bitplane(image_path: str, channel: str, bit: int) -> Optional[bytes]:
+def _generate_bitplane(rgba: np.ndarray, channel: str, bit: int) -> Optional[bytes]:
     """Generate a single bit-plane image."""
     try:
-        img = Image.open(image_path).convert("RGBA")
-        width, height = img.size
+        channel_idx = {"R": 0, "G": 1, "B": 2, "A": 3}.get(channel, 0)
+        return _mask_png(_bit_mask(rgba, [channel_idx], bit))
+    except Exception:
+        return None
 
-        # Create new image for this bit plane
-        plane_img = Image.new("L", (width, height))
-        pixels = plane_img.load()
 
-        channel_idx = {"R": 0, "G": 1, "B": 2, "A": 3}.get(channel, 0)
+@st.cache_data(show_spinner=False, max_entries=32)
+def _bitplane_png(path: str, mtime: float, size: int, channel: str, bit: int) -> Optional[bytes]:
+    """Bit-plane PNG for one channel/bit; *mtime* and *size* only key the cache."""
+    return _generate_bitplane(_load_rgba(path, mtime, size), channel, bit)
 
-        for y in range(height):
-            for x in range(width):
-                pixel = img.getpixel((x, y))
-                channel_value = pixel[channel_idx]
-                bit_value = (channel_value >> bit) & 1
-                pixels[x, y] = 255 if bit_value else 0
 
-        buf = io.BytesIO()
-        plane_img.save(buf, format="PNG")
-        return buf.getvalue()
+def _cached_bitplane(image_path: str, channel: str, bit: int) -> Optional[bytes]:
+    """Return the memoized bit-plane PNG, or None if the image can't be read."""
+    try:
+        stat = os.stat(image_path)
+        return _bitplane_png(str(image_path), stat.st_mtime, stat.st_size, channel, bit)
     except Exception:
         return None
 
@@ -437,6 +576,7 @@ def _generate_bitplane(image_path: str, channel: str, bit: int) -> Optional[byte
 def render_bitplane_explorer(result: Dict[str, Any]) -> None:
     """Display bit-plane explorer with lazy generation."""
     image_path = result.get("bitplane_path")
+    # A stat is enough here; planes are decoded only when a button asks for one.
     if not image_path or not Path(image_path).exists():
         st.caption("Bit-plane explorer not available for this image.")
         return
@@ -453,42 +593,111 @@ def render_bitplane_explorer(result: Dict[str, Any]) -> None:
         for bit_idx, col in zip(bits, cols):
             with col:
                 if st.button(f"Bit {bit_idx}", key=f"bitplane-{channel}-{bit_idx}"):
-                    plane_bytes = _generate_bitplane(image_path, channel, bit_idx)
+                    plane_bytes = _cached_bitplane(image_path, channel, bit_idx)
                     if plane_bytes:
                         st.image(plane_bytes, caption=f"{channel} Bit {bit_idx}", use_column_width=True)
 
 
-def _attempt_decode_text(data: bytes, method: str) -> Optional[str]:
-    """Attempt to decode data using various methods."""
+# Latin-1 code points that do not count towards the printable ratio; stripping them
+# with bytes.translate keeps the common single-byte case in C.
+_NON_PRINTABLE_LATIN1 = bytes(
+    i for i in range(256) if not (chr(i).isprintable() or chr(i) in "\n\r\t")
+)
+
+
+def _printable_ratio(text: str) -> float:
+    """Fraction of printable characters in *text*, counting tab, newline and CR."""
+    if not text:
+        return 0.0
     try:
+        data = text.encode("latin-1")
+    except UnicodeEncodeError:
+        return sum(c.isprintable() or c in "\n\r\t" for c in text) / len(text)
+    return len(data.translate(None, _NON_PRINTABLE_LATIN1)) / len(data)
+
+
+# Characters of the standard base64 alphabet, padding and line breaks.
+_BASE64_CHARS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\r\n"
+
+
+_ROT13_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
+    "NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm",
+)
+
+
+# Printable-ratio verdicts look at this many leading characters; embedded
+# payloads start at the head of the stream and the rest is usually noise.
+_PRINTABLE_SAMPLE_CHARS = 4096
+
+
+def _printable_enough(text: str) -> bool:
+    """True when more than 70% of the sampled head of *text* is printable."""
+    return _printable_ratio(text[:_PRINTABLE_SAMPLE_CHARS]) > 0.7
+
+
+def _looks_like_base64(data: bytes, sample_size: int = 256) -> bool:
+    """Cheap pre-check: more than 80% of the leading bytes are base64 characters."""
+    sample = data[:sample_size]
+    if not sample:
+        return False
+    foreign = len(sample.translate(None, _BASE64_CHARS))
+    return (len(sample) - foreign) / len(sample) > 0.8
+
+
+def _looks_like_zlib(data: bytes) -> bool:
+    """Check the zlib header: deflate method, valid window size and FCHECK."""
+    return (
+        len(data) >= 2
+        and data[0] & 0x0F == 8
+        and data[0] >> 4 <= 7
+        and ((data[0] << 8) | data[1]) % 31 == 0
+    )
+
+
+def _attempt_decode_text(data: bytes, method: str, utf8_text: Optional[str] = None) -> Optional[str]:
+    """Attempt to decode data using various methods.
+
+    *utf8_text* is ``data`` decoded as lenient UTF-8; callers trying several
+    methods on the same bytes pass it so the decode happens once.
+    """
+    if utf8_text is None and method in ("utf-8", "url-decode", "rot13"):
+        utf8_text = data.decode("utf-8", errors="ignore")
+    try:
+        # Each branch screens a cheap head of its output before doing the full decode.
         if method == "utf-8":
-            text = data.decode("utf-8", errors="ignore")
-        elif method == "utf-16le":
-            text = data.decode("utf-16le", errors="ignore")
-        elif method == "utf-16be":
-            text = data.decode("utf-16be", errors="ignore")
+            text = utf8_text
+        elif method in ("utf-16le", "utf-16be"):
+            head = data[: 2 * _PRINTABLE_SAMPLE_CHARS].decode(method, errors="ignore")
+            if not _printable_enough(head):
+                return None
+            text = data.decode(method, errors="ignore")
         elif method == "base64→utf-8":
+            if not _looks_like_base64(data):
+                return None
             decoded = base64.b64decode(data)
             text = decoded.decode("utf-8", errors="ignore")
         elif method == "zlib→utf-8":
+            if not _looks_like_zlib(data):
+                return None
+            head_bytes = zlib.decompressobj().decompress(data, 4 * _PRINTABLE_SAMPLE_CHARS)
+            if not _printable_enough(head_bytes.decode("utf-8", errors="ignore")):
+                return None
             decompressed = zlib.decompress(data)
             text = decompressed.decode("utf-8", errors="ignore")
         elif method == "url-decode":
-            text = data.decode("utf-8", errors="ignore")
             import urllib.parse
-            text = urllib.parse.unquote(text)
+            text = urllib.parse.unquote(utf8_text)
         elif method == "rot13":
-            text = data.decode("utf-8", errors="ignore")
-            text = text.translate(str.maketrans(
-                "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
-                "NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm"
-            ))
+            # ROT13 maps letters to letters, so printability is unchanged.
+            if not _printable_enough(utf8_text):
+                return None
+            text = utf8_text.translate(_ROT13_TABLE)
         else:
             return None
 
         # Filter out binary-looking content
-        printable_ratio = sum(1 for c in text if c.isprintable() or c in '\n\r\t') / max(len(text), 1)
-        if printable_ratio > 0.7 and len(text.strip()) > 10:
+        if _printable_enough(text) and len(text.strip()) > 10:
             return text
         return None
     except Exception:
@@ -501,35 +710,30 @@ def render_channel_text_dumps(result: Dict[str, Any]) -> None:
     if not image_path or not Path(image_path).exists():
         st.caption("Channel text dumps not available.")
         return
+    arr = _rgba_array(image_path)
+    if arr is None:
+        st.caption("Channel text dumps not available.")
+        return
 
     methods = ["utf-8", "utf-16le", "utf-16be", "base64→utf-8", "zlib→utf-8", "url-decode", "rot13"]
 
     # Extract raw data from LSB of each channel
     try:
-        img = Image.open(image_path).convert("RGBA")
-        width, height = img.size
+        # Row-major pixel order; a trailing partial byte is dropped.
+        usable_bits = arr.shape[0] * arr.shape[1] // 8 * 8
+        # One contiguous scratch plane is reused for every channel's LSBs.
+        bits = np.empty(arr.shape[:2], dtype=np.uint8)
 
         for channel_name, channel_idx in [("R", 0), ("G", 1), ("B", 2), ("A", 3)]:
-            # Extract LSB bits for this channel
-            bits = []
-            for y in range(height):
-                for x in range(width):
-                    pixel = img.getpixel((x, y))
-                    channel_value = pixel[channel_idx]
-                    bits.append(channel_value & 1)
-
-            # Convert bits to bytes
-            data = bytearray()
-            for i in range(0, len(bits), 8):
-                chunk = bits[i:i+8]
-                if len(chunk) == 8:
-                    value = sum(bit << (7 - idx) for idx, bit in enumerate(chunk))
-                    data.append(value)
-
-            # Try each decoding method
+            # Pack this channel's LSBs MSB-first into bytes
+            np.bitwise_and(arr[..., channel_idx], 1, out=bits)
+            data = np.packbits(bits.reshape(-1)[:usable_bits]).tobytes()
+
+            # Try each decoding method, sharing one UTF-8 decode between them
+            utf8_text = data.decode("utf-8", errors="ignore")
             found_any = False
             for method in methods:
-                text = _attempt_decode_text(bytes(data), method)
+                text = _attempt_decode_text(data, method, utf8_text)
                 if text:
                     if not found_any:
                         st.markdown(f"**{channel_name} channel**")
@@ -565,14 +769,10 @@ def render_diagnostics_detailed(result: Dict[str, Any]) -> None:
 
         st.markdown(f"**{tool}** — `{selector}` — {bytes_len} bytes")
 
-        # Find matching candidate to get hex preview
-        candidates = result.get("candidates", [])
-        for candidate in candidates:
-            if candidate.get("selector") == selector:
-                hex_preview = candidate.get("hex_preview", "")
-                if hex_preview:
-                    st.code(hex_preview, language=None)
-                break
+        # Hex previews are rendered by the decoder once per candidate
+        hex_preview = selector_info.get("hex_preview", "")
+        if hex_preview:
+            st.code(hex_preview, language=None)
 
         st.markdown("---")
 
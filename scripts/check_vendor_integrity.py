@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import mmap
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -16,8 +19,11 @@ def sha256_file(path: Path) -> str:
     """Return the SHA-256 hex digest for *path*."""
     digest = hashlib.sha256()
     with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(131072), b""):
-            digest.update(chunk)
+        # mmap rejects empty files; their digest is just the empty hash.
+        if os.fstat(handle.fileno()).st_size:
+            # Hash straight from the page cache without copying through Python buffers.
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
     return digest.hexdigest()
 
 
@@ -44,16 +50,22 @@ def compute_current_hashes() -> dict[str, str]:
     if not VENDOR_DIR.exists():
         raise FileNotFoundError(f"Vendor directory not found at {VENDOR_DIR}")
 
-    hashes: dict[str, str] = {}
+    paths: list[Path] = []
     for path in sorted(VENDOR_DIR.rglob("*")):
         if not path.is_file():
             continue
         if path.name == MANIFEST_PATH.name and path.parent == VENDOR_DIR:
             # Skip the manifest itself from the recomputed hashes.
             continue
-        rel_path = f"vendor/{path.relative_to(VENDOR_DIR).as_posix()}"
-        hashes[rel_path] = sha256_file(path)
-    return hashes
+        paths.append(path)
+
+    # hashlib releases the GIL while digesting, so files hash in parallel.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        digests = executor.map(sha256_file, paths)
+        return {
+            f"vendor/{path.relative_to(VENDOR_DIR).as_posix()}": digest
+            for path, digest in zip(paths, digests)
+        }
 
 
 def main() -> int:
@@ -6,57 +6,147 @@ Usage: python scripts/extract_with_zsteg.py <path_to_png>
 
 from __future__ import annotations
 
+import base64
+import json
 import subprocess
 import sys
 from pathlib import Path
+from typing import List, Optional
+
+SELECTORS = [
+    ("b1,r,lsb,xy", "LSB Red"),
+    ("b1,r,msb,xy", "MSB Red"),
+    ("b1,g,lsb,xy", "LSB Green"),
+    ("b1,b,lsb,xy", "LSB Blue"),
+    ("b1,rgb,lsb,xy", "LSB RGB"),
+]
+
+# zsteg only understands these containers; anything else is answered without Ruby.
+ZSTEG_SIGNATURES = (b"\x89PNG\r\n\x1a\n", b"BM")
+
+# ASCII code points that do not count as printable, stripped with bytes.translate.
+NON_PRINTABLE_ASCII = bytes(i for i in range(128) if not (chr(i).isprintable() or chr(i) in "\n\r\t"))
+
+# Runs every selector through zsteg's own CLI inside one Ruby process, so the
+# interpreter and gem load once per image instead of once per selector.
+ZSTEG_BATCH_SCRIPT = r"""
+require "json"
+require "stringio"
+require "zsteg"
+require "zsteg/cli/cli"
+
+path = ARGV.shift
+out = $stdout
+results = ARGV.map do |selector|
+  buffer = StringIO.new("".b)
+  ok = true
+  begin
+    $stdout = buffer
+    ZSteg::CLI::Cli.new(["-E", selector, path]).run
+  rescue SystemExit, StandardError
+    ok = false
+  ensure
+    $stdout = out
+  end
+  {"ok" => ok, "data" => [buffer.string].pack("m0")}
+end
+out.puts JSON.dump(results)
+"""
 
 
 def is_printable_text(text: str) -> bool:
     """Check if text appears to be printable (not binary garbage)."""
     if not text:
         return False
-    printable_chars = sum(1 for c in text if c.isprintable() or c in '\n\r\t')
+    if text.isascii():
+        printable_chars = len(text.encode("ascii").translate(None, NON_PRINTABLE_ASCII))
+    else:
+        printable_chars = sum(1 for c in text if c.isprintable() or c in '\n\r\t')
     ratio = printable_chars / len(text)
     return ratio > 0.7
 
 
-def extract_with_zsteg(image_path: Path) -> None:
-    """Extract hidden text from PNG using targeted zsteg selectors."""
-    if not image_path.exists():
-        print(f"Error: File not found: {image_path}", file=sys.stderr)
-        sys.exit(1)
+def run_zsteg_batch(image_path: Path) -> Optional[List[Optional[bytes]]]:
+    """Run every selector in one Ruby process; None when the gem cannot be loaded there.
 
-    selectors = [
-        ("b1,r,lsb,xy", "LSB Red"),
-        ("b1,r,msb,xy", "MSB Red"),
-        ("b1,g,lsb,xy", "LSB Green"),
-        ("b1,b,lsb,xy", "LSB Blue"),
-        ("b1,rgb,lsb,xy", "LSB RGB"),
+    Raises ValueError when the batch script ran but printed something other than JSON.
+    """
+    try:
+        result = subprocess.run(
+            ["ruby", "-e", ZSTEG_BATCH_SCRIPT, str(image_path), *(sel for sel, _ in SELECTORS)],
+            capture_output=True,
+            timeout=10 * len(SELECTORS),
+            check=False,
+        )
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    return [
+        base64.b64decode(output.get("data", "")) if output.get("ok") else None
+        for output in json.loads(result.stdout)
     ]
 
-    found_any = False
 
-    for selector, label in selectors:
+def run_zsteg_cli(image_path: Path) -> Optional[List[Optional[bytes]]]:
+    """Run ``zsteg -E`` once per selector; None when the zsteg binary is missing."""
+    outputs: List[Optional[bytes]] = []
+    for selector, _ in SELECTORS:
         try:
             result = subprocess.run(
                 ["zsteg", "-E", selector, str(image_path)],
                 capture_output=True,
-                text=True,
                 timeout=10,
                 check=False,
             )
-            if result.returncode == 0 and result.stdout:
-                text = result.stdout.strip()
-                # Filter out empty or binary-looking content
-                if text and len(text) > 0 and is_printable_text(text[:200]):
-                    print(f"\n=== {label} ({selector}) ===")
-                    print(text)
-                    found_any = True
         except subprocess.TimeoutExpired:
             print(f"Warning: Timeout for selector {selector}", file=sys.stderr)
+            outputs.append(None)
+            continue
         except FileNotFoundError:
-            print("Error: zsteg not found. Please install zsteg (gem install zsteg)", file=sys.stderr)
-            sys.exit(1)
+            return None
+        outputs.append(result.stdout if result.returncode == 0 else None)
+    return outputs
+
+
+def extract_with_zsteg(image_path: Path) -> None:
+    """Extract hidden text from PNG using targeted zsteg selectors."""
+    if not image_path.exists():
+        print(f"Error: File not found: {image_path}", file=sys.stderr)
+        sys.exit(1)
+
+    with image_path.open("rb") as handle:
+        if not handle.read(8).startswith(ZSTEG_SIGNATURES):
+            print("Skipping zsteg: it only reads PNG and BMP images.", file=sys.stderr)
+            print("No hidden text detected in the image.")
+            return
+
+    try:
+        outputs = run_zsteg_batch(image_path)
+    except subprocess.TimeoutExpired:
+        print("Warning: Timeout running zsteg selectors", file=sys.stderr)
+        outputs = []
+    except ValueError as exc:
+        print(f"Error: could not parse the zsteg batch output: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if outputs is None:
+        # No Ruby, or the gem cannot be required in-process: use the zsteg CLI instead.
+        outputs = run_zsteg_cli(image_path)
+    if outputs is None:
+        print("Error: zsteg not found. Please install zsteg (gem install zsteg)", file=sys.stderr)
+        sys.exit(1)
+
+    found_any = False
+
+    for (selector, label), output in zip(SELECTORS, outputs):
+        if output is None:
+            continue
+        text = output.decode("utf-8", errors="replace").strip()
+        # Filter out empty or binary-looking content
+        if text and len(text) > 0 and is_printable_text(text[:200]):
+            print(f"\n=== {label} ({selector}) ===")
+            print(text)
+            found_any = True
 
     if not found_any:
         print("No hidden text detected in the image.")
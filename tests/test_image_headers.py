@@ -0,0 +1,113 @@
+"""Test header-only image dimension parsing against Pillow."""
+
+from __future__ import annotations
+
+import io
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Dict
+
+import pytest
+from PIL import Image, features
+
+# Ensure app package is importable
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.adapters.decoder_adapter import _detect_format, _extract_meta, _header_dimensions
+
+SIZE = (37, 23)
+
+
+def _save(**params: object) -> bytes:
+    img = Image.new("RGB", SIZE, color="teal")
+    buffer = io.BytesIO()
+    img.save(buffer, **params)
+    return buffer.getvalue()
+
+
+def _os2_bmp() -> bytes:
+    """Build a 24-bit OS/2 (BITMAPCOREHEADER) bitmap by hand; Pillow only reads them."""
+    width, height = SIZE
+    stride = (width * 3 + 3) & ~3
+    pixels = b"\x80\x40\x20" * width + b"\x00" * (stride - width * 3)
+    header = struct.pack("<IHHHH", 12, width, height, 1, 24)
+    offset = 14 + len(header)
+    file_header = b"BM" + struct.pack("<IHHI", offset + stride * height, 0, 0, offset)
+    return file_header + header + pixels * height
+
+
+def _top_down_bmp() -> bytes:
+    """A BITMAPINFOHEADER bitmap stored top-down, i.e. with a negative height."""
+    data = bytearray(_save(format="BMP"))
+    struct.pack_into("<i", data, 22, -SIZE[1])
+    return bytes(data)
+
+
+CASES: Dict[str, Callable[[], bytes]] = {
+    "png": lambda: _save(format="PNG"),
+    "jpeg-baseline": lambda: _save(format="JPEG"),
+    "jpeg-progressive": lambda: _save(format="JPEG", progressive=True),
+    "jpeg-exif": lambda: _save(format="JPEG", exif=Image.Exif().tobytes() + b"\x00" * 64),
+    "bmp": lambda: _save(format="BMP"),
+    "bmp-top-down": _top_down_bmp,
+    "bmp-os2": _os2_bmp,
+    "webp-lossy": lambda: _save(format="WEBP", quality=80),
+    "webp-lossless": lambda: _save(format="WEBP", lossless=True),
+    # EXIF metadata forces the extended (VP8X) layout.
+    "webp-extended": lambda: _save(format="WEBP", quality=80, exif=Image.Exif().tobytes()),
+}
+
+needs_webp = pytest.mark.skipif(not features.check("webp"), reason="Pillow built without WebP")
+PARAMS = [
+    pytest.param(name, marks=needs_webp) if name.startswith("webp") else name for name in CASES
+]
+
+
+def _pillow_size(data: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(data)) as img:
+        return img.size
+
+
+@pytest.mark.parametrize("name", PARAMS)
+def test_header_dimensions_match_pillow(name: str) -> None:
+    """Every supported container reports the same size as Pillow."""
+    data = CASES[name]()
+    image_format = _detect_format(data)
+    assert image_format != "UNKNOWN"
+    assert _header_dimensions(data, image_format) == _pillow_size(data) == SIZE
+
+
+def test_webp_chunk_kinds() -> None:
+    """The WebP cases cover all three chunk layouts the parser handles."""
+    if not features.check("webp"):
+        pytest.skip("Pillow built without WebP")
+    chunks = {CASES[name]()[12:16] for name in CASES if name.startswith("webp")}
+    assert chunks == {b"VP8 ", b"VP8L", b"VP8X"}
+
+
+@pytest.mark.parametrize("name", PARAMS)
+def test_truncated_headers_never_guess(name: str) -> None:
+    """A cut-off header yields no size rather than a wrong one, and never raises."""
+    data = CASES[name]()
+    image_format = _detect_format(data)
+    for cut in range(len(data) if len(data) < 1024 else 1024):
+        dimensions = _header_dimensions(data[:cut], image_format)
+        assert dimensions is None or dimensions == SIZE, cut
+
+
+@pytest.mark.parametrize("name", PARAMS)
+def test_extract_meta_on_truncated_input(name: str) -> None:
+    """_extract_meta falls back to Pillow (or UNKNOWN) when the header is incomplete."""
+    data = CASES[name]()
+    for cut in (0, 8, 20, 40):
+        meta = _extract_meta(data[:cut])
+        reported = (meta["width"], meta["height"])
+        try:
+            expected = _pillow_size(data[:cut])
+        except Exception:
+            assert reported in (SIZE, (0, 0)), cut
+        else:
+            assert reported == expected, cut
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import io
 import sys
 from pathlib import Path
 
 import pytest
+from PIL import Image
 
 # Ensure app package is importable
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -22,9 +24,6 @@ TEST_MESSAGE = "Eclipsera test: secure transmission confirmed."
 @pytest.fixture
 def sample_cover_image() -> bytes:
     """Create a simple test PNG image."""
-    from PIL import Image
-    import io
-
     # Create a small test image
     img = Image.new("RGB", (100, 100), color=(73, 109, 137))
     buffer = io.BytesIO()
@@ -109,17 +108,18 @@ def test_png_channels_rgb_encode_decode(sample_cover_image: bytes) -> None:
 
 def test_png_analyzers_skipped() -> None:
     """Test that steghide and outguess are marked as SKIPPED for PNG."""
-    from PIL import Image
-    import io
-
     # Create a simple PNG
     img = Image.new("RGB", (50, 50), color="blue")
     buffer = io.BytesIO()
     img.save(buffer, format="PNG")
     png_bytes = buffer.getvalue()
+    # Both runs share one decoded image for the built-in LSB probe
+    rgba = img.convert("RGBA")
 
     # Analyze without deep mode
-    result = analyze_image(png_bytes, options=DecoderOptions(filename="test.png", deep=False))
+    result = analyze_image(
+        png_bytes, options=DecoderOptions(filename="test.png", deep=False), rgba_image=rgba
+    )
 
     # Check that steghide is skipped
     assert "steghide" in result["results"]
@@ -127,7 +127,9 @@ def test_png_analyzers_skipped() -> None:
     assert "PNG not supported" in result["results"]["steghide"]["reason"]
 
     # Analyze with deep mode
-    result_deep = analyze_image(png_bytes, options=DecoderOptions(filename="test.png", deep=True))
+    result_deep = analyze_image(
+        png_bytes, options=DecoderOptions(filename="test.png", deep=True), rgba_image=rgba
+    )
 
     # Check that both steghide and outguess are skipped
     assert result_deep["results"]["steghide"]["status"] == "skipped"
@@ -0,0 +1,114 @@
+"""Test the slab-wise LSB recovery in the roundtrip harness against a full decode."""
+
+from __future__ import annotations
+
+import io
+import random
+import sys
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Ensure app package is importable
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import run_roundtrip
+from scripts.run_roundtrip import attempt_recover_message
+
+
+def _reference_recover(image_bytes: bytes, plane: str, zipped: bool) -> Optional[str]:
+    """The original per-pixel decoder: walk every pixel until eight zero bits in a row."""
+    order = [c for c in "RGBA" if c in plane] or ["R", "G", "B"]
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        img = img.convert("RGBA")
+        bits: List[int] = []
+        for y in range(img.height):
+            for x in range(img.width):
+                channel_map = dict(zip("RGBA", img.getpixel((x, y))))
+                for channel in order:
+                    bits.append(channel_map[channel] & 1)
+                    if len(bits) >= 8 and bits[-8:] == [0] * 8:
+                        data = bits[:-8]
+                        payload = bytes(
+                            int("".join(map(str, data[i : i + 8])), 2)
+                            for i in range(0, len(data) - len(data) % 8, 8)
+                        )
+                        try:
+                            if zipped:
+                                payload = zlib.decompress(payload)
+                            return payload.decode("utf-8", errors="ignore")
+                        except Exception:
+                            return None
+    return None
+
+
+def _image_with_bits(bits: List[int], plane: str, width: int, height: int) -> bytes:
+    """Lay `bits` into the LSBs of `plane`'s channels, row-major, padding with ones."""
+    channels = [run_roundtrip.CHANNEL_INDEX[c] for c in "RGBA" if c in plane]
+    capacity = width * height * len(channels)
+    assert len(bits) <= capacity
+    lsbs = np.ones(capacity, dtype=np.uint8)
+    lsbs[: len(bits)] = bits
+    arr = np.full((height, width, 4), 0xA4, dtype=np.uint8)
+    arr[:, :, channels] |= lsbs.reshape(height, width, len(channels))
+    buffer = io.BytesIO()
+    Image.fromarray(arr, "RGBA").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _message_bits(rng: random.Random, length: int) -> List[int]:
+    """Random bits without a run of eight zeros, so the terminator is the first such run."""
+    bits: List[int] = []
+    while len(bits) < length:
+        bits.append(1 if bits[-7:] == [0] * 7 else rng.getrandbits(1))
+    return bits
+
+
+@pytest.fixture
+def small_slabs(monkeypatch: pytest.MonkeyPatch) -> None:
+    # One 5-pixel row per slab, so terminators regularly straddle a slab boundary.
+    monkeypatch.setattr(run_roundtrip, "LSB_SLAB_PIXELS", 5)
+
+
+@pytest.mark.parametrize("plane", ["R", "RGB", "RGBA"])
+def test_terminator_at_every_offset(small_slabs: None, plane: str) -> None:
+    """Byte-aligned or not, inside a slab or across its edge, both decoders agree."""
+    rng = random.Random(plane)
+    width, height = 5, 12
+    slab_bits = width * len(plane)
+    for length in range(0, 4 * slab_bits):
+        bits = _message_bits(rng, length) + [0] * 8
+        image_bytes = _image_with_bits(bits, plane, width, height)
+        expected = _reference_recover(image_bytes, plane, zipped=False)
+        assert attempt_recover_message(image_bytes, plane, zipped=False) == expected, length
+
+
+def test_terminator_split_across_slab_boundary(small_slabs: None) -> None:
+    """Four zero bits end one slab and four start the next."""
+    message = [int(b) for b in f"{ord('E'):08b}"] + [1, 1, 1]  # 11 bits, then the run
+    bits = message + [1] * (15 - len(message) - 4) + [0] * 8
+    image_bytes = _image_with_bits(bits, "RGB", width=5, height=4)
+    assert attempt_recover_message(image_bytes, "RGB", zipped=False) == "E"
+    assert _reference_recover(image_bytes, "RGB", zipped=False) == "E"
+
+
+def test_non_byte_aligned_terminator() -> None:
+    """A run starting mid-byte ends the payload there; the partial byte is dropped."""
+    bits = [int(b) for b in "".join(f"{c:08b}" for c in b"Hi")] + [1, 0, 1] + [0] * 8
+    image_bytes = _image_with_bits(bits, "RGB", width=8, height=8)
+    assert attempt_recover_message(image_bytes, "RGB", zipped=False) == "Hi"
+    assert _reference_recover(image_bytes, "RGB", zipped=False) == "Hi"
+
+
+def test_no_terminator_returns_none(small_slabs: None) -> None:
+    """Without eight zero bits there is no payload (the old decoder returned every LSB)."""
+    image_bytes = _image_with_bits([1] * 60, "RGB", width=5, height=4)
+    assert attempt_recover_message(image_bytes, "RGB", zipped=False) is None
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        assert attempt_recover_message(img, "RGB", zipped=False) is None
@@ -0,0 +1,178 @@
+"""Test the persistent zsteg worker against the zsteg CLI and its restart path."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+# Ensure app package is importable
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.adapters import decoder_adapter
+from app.adapters.decoder_adapter import _ZSTEG_WORKER_SCRIPT, ZSTEG_SELECTORS, _ZstegWorker
+from app.adapters.encoder_adapter import EncoderOptions, encode_text_to_image
+
+TEST_MESSAGE = "Eclipsera test: zsteg worker parity."
+
+# Stand-in for the Ruby worker speaking the same JSON-line protocol. It echoes the
+# selector back as the payload, hangs on "hang", exits on "crash" and stops reading
+# its stdin (while staying alive) on "close".
+FAKE_WORKER_SCRIPT = r"""
+import base64, json, os, sys, time
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    selector = json.loads(line)["selector"]
+    if selector == "hang":
+        time.sleep(60)
+    if selector == "crash":
+        sys.exit(1)
+    if selector == "close":
+        os.close(0)
+        print(json.dumps({"ok": True, "data": ""}), flush=True)
+        time.sleep(60)
+    data = base64.b64encode(selector.encode()).decode()
+    print(json.dumps({"ok": True, "data": data}), flush=True)
+"""
+
+
+# Minimal stand-in for the zsteg gem: the CLI prints the selector, the path and a few
+# non-UTF-8 bytes, and fails the way zsteg does (exit or exception) on request.
+STUB_ZSTEG_CLI = r"""
+module ZSteg
+  module CLI
+    class Cli
+      def initialize(argv)
+        @argv = argv
+      end
+
+      def run
+        selector = @argv[1]
+        exit 1 if selector == "exit"
+        raise ArgumentError, "bad selector" if selector == "raise"
+        print "#{selector}|#{@argv[2]}|"
+        $stdout.write("\x00\xff\n".b)
+      end
+    end
+  end
+end
+"""
+
+
+@pytest.fixture
+def fake_worker():
+    worker = _ZstegWorker([sys.executable, "-c", FAKE_WORKER_SCRIPT])
+    yield worker
+    worker._discard()
+
+
+@pytest.fixture
+def encoded_png(tmp_path: Path) -> Path:
+    """Write a PNG carrying TEST_MESSAGE in its RGB LSBs."""
+    cover = tmp_path / "cover.png"
+    Image.new("RGB", (64, 64), color=(73, 109, 137)).save(cover, format="PNG")
+    result = encode_text_to_image(
+        cover.read_bytes(),
+        TEST_MESSAGE,
+        options=EncoderOptions(twitter_safe=False, lsb_overall=True),
+    )
+    encoded = tmp_path / "encoded.png"
+    encoded.write_bytes(result["image_bytes"])
+    return encoded
+
+
+@pytest.mark.skipif(shutil.which("zsteg") is None, reason="zsteg is not installed")
+def test_worker_matches_zsteg_cli(encoded_png: Path) -> None:
+    """The in-process worker returns exactly what `zsteg -E` prints for each selector."""
+    worker = _ZstegWorker()
+    try:
+        for selector, _label in ZSTEG_SELECTORS:
+            cli = subprocess.run(
+                ["zsteg", "-E", selector, str(encoded_png)], capture_output=True, timeout=30
+            )
+            expected = cli.stdout if cli.returncode == 0 else None
+            assert worker.extract(selector, str(encoded_png), timeout=30) == expected, selector
+    finally:
+        if worker._process is not None:
+            worker._stop(worker._process)
+
+
+@pytest.mark.skipif(shutil.which("ruby") is None, reason="ruby is not installed")
+def test_worker_script_protocol(tmp_path: Path) -> None:
+    """The Ruby loop captures the CLI's stdout per request and ships it intact."""
+    (tmp_path / "zsteg.rb").write_text("module ZSteg; end\n")
+    (tmp_path / "zsteg" / "cli").mkdir(parents=True)
+    (tmp_path / "zsteg" / "cli" / "cli.rb").write_text(STUB_ZSTEG_CLI)
+    worker = _ZstegWorker(["ruby", "-I", str(tmp_path), "-e", _ZSTEG_WORKER_SCRIPT])
+    try:
+        assert worker.extract("b1,r,lsb,xy", "a.png") == b"b1,r,lsb,xy|a.png|\x00\xff\n"
+        process = worker._process
+        assert worker.extract("exit", "a.png") is None
+        assert worker.extract("raise", "a.png") is None
+        # Failures are answered in-band: same process, and no stray output on the pipe.
+        assert worker.extract("b1,b,lsb,xy", "b.png") == b"b1,b,lsb,xy|b.png|\x00\xff\n"
+        assert worker._process is process
+    finally:
+        worker._discard()
+
+
+def test_batch_shares_one_deadline(fake_worker: _ZstegWorker) -> None:
+    """A hang uses up the batch's deadline instead of adding a timeout per selector."""
+    start = time.monotonic()
+    payloads = fake_worker.extract_batch(["b1,r,lsb,xy", "hang", "b1,g,lsb,xy"], "x", 1)
+    assert time.monotonic() - start < 2
+    assert payloads == [b"b1,r,lsb,xy", None, None]
+
+
+def test_busy_worker_is_skipped(fake_worker: _ZstegWorker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A held worker is not waited on; with every worker busy the CLI path is used."""
+    with fake_worker._lock:
+        assert fake_worker.extract_batch(["b1,r,lsb,xy"], "x") is None
+        calls = []
+        monkeypatch.setattr(decoder_adapter, "_ZSTEG_WORKERS", (fake_worker,))
+        monkeypatch.setattr(
+            decoder_adapter, "_run_zsteg_processes", lambda image_arg: calls.append(image_arg) or []
+        )
+        assert decoder_adapter._extract_with_zsteg(Path("x.png")) == []
+        assert calls == ["x.png"]
+
+
+def test_broken_pipe_reaps_worker(fake_worker: _ZstegWorker) -> None:
+    """A worker that stops reading is killed and reaped, not just forgotten."""
+    assert fake_worker.extract("close", "x") == b""
+    process = fake_worker._process
+    assert process is not None
+    assert fake_worker.extract("b1,r,lsb,xy", "x") is None
+    assert process.returncode is not None
+    assert process.stdin is not None and process.stdin.closed
+    assert fake_worker.extract("b1,r,lsb,xy", "x") == b"b1,r,lsb,xy"
+
+
+def test_worker_restarts_after_hang_and_crash() -> None:
+    """A hung or crashed worker is replaced and the next request is answered."""
+    worker = _ZstegWorker([sys.executable, "-c", FAKE_WORKER_SCRIPT])
+    try:
+        assert worker.extract("b1,r,lsb,xy", "image.png") == b"b1,r,lsb,xy"
+        first = worker._process
+        assert first is not None
+
+        assert worker.extract("hang", "image.png", timeout=0.5) is None
+        assert first.poll() is not None  # the hung process was killed
+
+        assert worker.extract("b1,g,lsb,xy", "image.png") == b"b1,g,lsb,xy"
+        second = worker._process
+        assert second is not None and second.pid != first.pid
+
+        assert worker.extract("crash", "image.png") is None
+        assert worker.extract("b1,b,lsb,xy", "image.png") == b"b1,b,lsb,xy"
+        assert worker._process is not None and worker._process.pid != second.pid
+    finally:
+        if worker._process is not None:
+            worker._stop(worker._process)